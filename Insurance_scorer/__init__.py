@@ -1567,6 +1567,7 @@ def sync_zoho_users_all(access_token, zoho_users_collection=None):
 
                 doc = {
                     "id": cur_id,
+                    "employee_id_str": cur_id,  # Leaderboard's Zoho_Users join key
                     "full_name": u.get("full_name"),
                     "email": u.get("email"),
                     "status": u.get("status"),
@@ -1681,6 +1682,7 @@ def fetch_active_employee_ids(access_token, zoho_users_collection=None):
                 }
                 if not doc["id"]:
                     continue  # skip if no id
+                doc["employee_id_str"] = doc["id"]  # Leaderboard's Zoho_Users join key
                 res = zoho_users_collection.update_one(
                     {"id": doc["id"]},
                     {"$set": doc},
@@ -609,31 +609,48 @@ def build_public_leaderboard_pipeline(month: str, start: datetime, end: datetime
             }
         },
         # is_active and eligibility window from Zoho_Users
+        # _id.employee_id is already a string ($toString in every branch above); join on the
+        # materialised Zoho_Users.employee_id_str so the lookup is index-backed
+        # (see ensure_zoho_lookup_key) instead of a $toString scan per row.
+        # Plain localField lookup (localField + pipeline would need MongoDB 5.0+), then the
+        # matched users are trimmed to the fields used below. A null employee_id would match
+        # every user lacking the key (missing equals null), so those rows keep an empty zu.
         {
             "$lookup": {
                 "from": "Zoho_Users",
-                "let": {"emp": {"$toString": "$_id.employee_id"}},
-                "pipeline": [
-                    {"$match": {"$expr": {"$eq": [{"$toString": "$id"}, "$$emp"]}}},
-                    {
-                        "$project": {
-                            "_id": 0,
-                            "status": "$status",
-                            "Status": "$Status",
-                            "active": "$active",
-                            "is_active": "$is_active",
-                            "IsActive": "$IsActive",
-                            "inactive_since": "$inactive_since",
-                            "employee_id": "$employee_id",
-                            "Employee ID": "$Employee ID",
-                            "full": "$Full Name",
-                            "alt": "$Name",
-                        }
-                    },
-                ],
+                "localField": "_id.employee_id",
+                "foreignField": "employee_id_str",
                 "as": "zu",
             }
         },
+        {
+            "$set": {
+                "zu": {
+                    "$map": {
+                        "input": {
+                            "$cond": [
+                                {"$eq": [{"$type": "$_id.employee_id"}, "string"]},
+                                "$zu",
+                                [],
+                            ]
+                        },
+                        "as": "u",
+                        "in": {
+                            "status": "$$u.status",
+                            "Status": "$$u.Status",
+                            "active": "$$u.active",
+                            "is_active": "$$u.is_active",
+                            "IsActive": "$$u.IsActive",
+                            "inactive_since": "$$u.inactive_since",
+                            "employee_id": "$$u.employee_id",
+                            "Employee ID": "$$u.Employee ID",
+                            "full": "$$u.Full Name",
+                            "alt": "$$u.Name",
+                        },
+                    }
+                }
+            }
+        },
         {
             "$addFields": {
                 "has_zoho_user": {"$gt": [{"$size": "$zu"}, 0]},
@@ -1850,6 +1867,28 @@ def _log_public_leaderboard_debug(db, period_month: str) -> None:
         )
 
 
+def ensure_zoho_lookup_key(db) -> int:
+    """
+    Materialise Zoho_Users.employee_id_str ($toString of `id`) and index it, so the
+    public leaderboard's Zoho $lookup can use localField/foreignField.
+
+    The Zoho_Users syncs in Insurance_scorer write the key on every upsert; this covers
+    docs synced before that. Idempotent (only missing/stale keys are rewritten) but the $expr
+    filter scans the whole collection, so this is a one-off backfill
+    (tools/backfill_zoho_lookup_key.py), not part of Leaderboard.run. Returns the number of
+    docs modified.
+    """
+    res = db.Zoho_Users.update_many(
+        {"$expr": {"$ne": ["$employee_id_str", {"$toString": "$id"}]}},
+        [{"$set": {"employee_id_str": {"$toString": "$id"}}}],
+    )
+    try:
+        db.Zoho_Users.create_index([("employee_id_str", 1)])
+    except Exception:
+        logging.exception("[Leaderboard] Failed to ensure Zoho_Users.employee_id_str index")
+    return res.modified_count
+
+
 # ---------- Runner ----------
 def run(
     month: str,
@@ -1888,6 +1927,17 @@ def run(
         except Exception:
             pass
 
+    # Join key for the Zoho_Users lookup in the public leaderboard pipeline is written by the
+    # Zoho syncs; warn (index-backed check, read-only) when older users still lack it
+    try:
+        if db.Zoho_Users.find_one({"employee_id_str": {"$exists": False}}, {"_id": 1}):
+            logging.warning(
+                "[Leaderboard] Zoho_Users without employee_id_str found; their rows miss the "
+                "Zoho join until tools/backfill_zoho_lookup_key.py is run"
+            )
+    except Exception:
+        logging.exception("[Leaderboard] Failed to check Zoho_Users.employee_id_str backfill")
+
     # Decide which months to process
     if process_full_fy:
         months = fy_months_for(month)
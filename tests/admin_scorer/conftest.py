@@ -54,14 +54,35 @@ def test_db(mongo_client):
     """Test database instance."""
     return mongo_client[TEST_DB_NAME]
 
+CONFIG_IDS = ["Leaderboard_Lumpsum", "Leaderboard_SIP"]
+
+@pytest.fixture(scope="session")
+def purged_config_ids():
+    """Config doc ids already purged in this session (per xdist worker)."""
+    return set()
+
 @pytest.fixture(scope="function")
-def clean_config(test_db):
-    """Clean config collection before each test."""
-    # Drop config docs to ensure clean state
-    test_db.config.delete_many({"_id": {"$in": ["Leaderboard_Lumpsum", "Leaderboard_SIP"]}})
+def clean_config(request, test_db, purged_config_ids):
+    """
+    Clean config collection around each test.
+
+    Leftover docs (e.g. from an aborted run) are purged the first time a doc id
+    is used in the session; after that every test deletes what it wrote on
+    teardown (which runs even on failure), so one delete per test suffices.
+
+    Test classes declare the config docs they touch via ``config_ids`` and are
+    pinned to a matching ``xdist_group``, so under ``-n <N> --dist loadgroup``
+    the Lumpsum and SIP suites run on separate workers without clobbering each
+    other's documents in the shared test DB.
+    """
+    config_ids = getattr(request.cls, "config_ids", CONFIG_IDS)
+    stale = [cid for cid in config_ids if cid not in purged_config_ids]
+    if stale:
+        test_db.config.delete_many({"_id": {"$in": stale}})
+        purged_config_ids.update(stale)
     yield
     # Cleanup after test
-    test_db.config.delete_many({"_id": {"$in": ["Leaderboard_Lumpsum", "Leaderboard_SIP"]}})
+    test_db.config.delete_many({"_id": {"$in": config_ids}})
 
 @pytest.fixture
 def session():
@@ -25,9 +25,12 @@ from SIP_Scorer import (
 )
 
 
+@pytest.mark.xdist_group("config_lumpsum")
 class TestLumpsumConfigDefaults:
     """Test that Lumpsum config GET returns exact Python defaults when config missing."""
 
+    config_ids = ["Leaderboard_Lumpsum"]
+
     def test_get_lumpsum_default_state(self, session, api_base_url, clean_config):
         """GET lumpsum with no config doc should return Python DEFAULT_* constants exactly."""
         response = session.get(f"{api_base_url}/lumpsum")
@@ -53,9 +56,12 @@ class TestLumpsumConfigDefaults:
         assert data["raw_config"] == {}
 
 
+@pytest.mark.xdist_group("config_sip")
 class TestSIPConfigDefaults:
     """Test that SIP config GET returns exact Python defaults when config missing."""
 
+    config_ids = ["Leaderboard_SIP"]
+
     def test_get_sip_default_state(self, session, api_base_url, clean_config):
         """GET sip with no config doc should return Python DEFAULT_* constants exactly."""
         response = session.get(f"{api_base_url}/sip")
@@ -76,9 +82,12 @@ class TestSIPConfigDefaults:
         assert effective["sip_points_coeff"] == SIP_POINTS_COEFF
 
 
+@pytest.mark.xdist_group("config_lumpsum")
 class TestLumpsumConfigPersistence:
     """Test that Lumpsum config PUT validates and persists correctly."""
 
+    config_ids = ["Leaderboard_Lumpsum"]
+
     def test_put_lumpsum_valid_config_persists(self, session, api_base_url, test_db, clean_config):
         """PUT valid lumpsum config should persist with version tracking."""
         payload = {
@@ -135,9 +144,12 @@ class TestLumpsumConfigPersistence:
         assert doc["version"] == 2
 
 
+@pytest.mark.xdist_group("config_sip")
 class TestSIPConfigPersistence:
     """Test that SIP config PUT validates and persists correctly."""
 
+    config_ids = ["Leaderboard_SIP"]
+
     def test_put_sip_valid_config_persists(self, session, api_base_url, test_db, clean_config):
         """PUT valid sip config should persist with version tracking."""
         payload = {
@@ -167,9 +179,12 @@ class TestSIPConfigPersistence:
         assert raw["schema_version"] == SCHEMA_VERSION_SIP
 
 
+@pytest.mark.xdist_group("config_lumpsum")
 class TestLumpsumValidation:
     """Test that Lumpsum config validation prevents invalid data."""
 
+    config_ids = ["Leaderboard_Lumpsum"]
+
     def test_put_lumpsum_invalid_rate_slabs_no_write(self, session, api_base_url, test_db, clean_config):
         """PUT with min_pct >= max_pct should return 400 and NOT write to DB."""
         payload = {
@@ -226,9 +241,12 @@ class TestLumpsumValidation:
         assert doc is None
 
 
+@pytest.mark.xdist_group("config_sip")
 class TestSIPValidation:
     """Test that SIP config validation prevents invalid data."""
 
+    config_ids = ["Leaderboard_SIP"]
+
     def test_put_sip_invalid_tier_thresholds_no_write(self, session, api_base_url, test_db, clean_config):
         """PUT with invalid tier_thresholds format should return 400 and NOT write."""
         payload = {
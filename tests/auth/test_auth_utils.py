@@ -0,0 +1,83 @@
+"""
+Unit tests for the JWT cookie lookup in utils.auth_utils.
+
+The regex fast path must pick the same token SimpleCookie would, so each case
+is also checked against SimpleCookie where it parses the header.
+"""
+
+import os
+import sys
+from http.cookies import SimpleCookie
+from unittest.mock import patch
+
+import pytest
+import azure.functions as func
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT_DIR)
+
+from utils import auth_utils
+
+
+def _request(headers):
+    return func.HttpRequest(method="GET", url="/api/test", headers=headers, body=b"")
+
+
+@pytest.fixture(autouse=True)
+def echo_token(monkeypatch):
+    """verify_jwt_token stub: the 'email' is the token itself, so tests see which one was picked."""
+    monkeypatch.delenv("JWT_COOKIE_NAME", raising=False)
+    with patch.object(auth_utils, "verify_jwt_token", side_effect=lambda t: {"email": t}) as m:
+        yield m
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("auth_token=tok.abc.def", "tok.abc.def"),
+    ("theme=dark; auth_token=tok.abc.def; lang=en", "tok.abc.def"),
+    ("theme=dark;auth_token=tok.abc.def", "tok.abc.def"),
+    ("  auth_token = tok.abc.def ;theme=dark", "tok.abc.def"),
+    ("auth_token=tok.abc.def;", "tok.abc.def"),
+])
+def test_regex_path(header, expected, echo_token):
+    assert auth_utils.get_email_from_jwt_cookie(_request({"Cookie": header})) == expected
+    echo_token.assert_called_once_with(expected)
+    assert SimpleCookie(header)["auth_token"].value == expected
+
+
+def test_duplicate_cookie_last_wins():
+    header = "auth_token=first; theme=dark; auth_token=second"
+    assert auth_utils.get_email_from_jwt_cookie(_request({"Cookie": header})) == "second"
+    assert SimpleCookie(header)["auth_token"].value == "second"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('auth_token="tok.abc.def"', "tok.abc.def"),
+    ('theme=dark; auth_token="tok\\073abc"', "tok;abc"),
+    ('auth_token=first; auth_token="second"', "second"),
+])
+def test_quoted_value_falls_back_to_simplecookie(header, expected):
+    assert auth_utils.get_email_from_jwt_cookie(_request({"Cookie": header})) == expected
+    assert SimpleCookie(header)["auth_token"].value == expected
+
+
+@pytest.mark.parametrize("header", [
+    "x_auth_token=tok.abc.def",
+    "theme=dark; my-auth_token=tok.abc.def",
+    "auth_token=; theme=dark",
+    "auth_token=",
+    "theme=dark",
+])
+def test_missing_or_empty_cookie(header, echo_token):
+    assert auth_utils.get_email_from_jwt_cookie(_request({"Cookie": header})) is None
+    echo_token.assert_not_called()
+
+
+def test_custom_cookie_name(monkeypatch):
+    monkeypatch.setenv("JWT_COOKIE_NAME", "pli.session")
+    header = "plixsession=wrong; pli.session=tok.abc.def"
+    assert auth_utils.get_email_from_jwt_cookie(_request({"Cookie": header})) == "tok.abc.def"
+
+
+def test_bearer_header_used_without_cookie():
+    req = _request({"Authorization": "Bearer tok.abc.def"})
+    assert auth_utils.get_email_from_jwt_cookie(req) == "tok.abc.def"
@@ -0,0 +1,158 @@
+"""
+Unit tests for the Admin_Permissions role cache and checks in utils.rbac.
+
+get_db is stubbed with an in-memory collection that counts find_one calls, and the
+cache clock is replaced so TTL expiry can be stepped deterministically.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT_DIR)
+
+from utils import rbac
+
+
+class FakePermissions:
+    """Admin_Permissions stand-in: {email: roles}, optionally raising on find_one."""
+
+    def __init__(self, roles_by_email):
+        self.roles_by_email = roles_by_email
+        self.calls = []
+        self.error = None
+
+    def find_one(self, query, projection=None, **kwargs):
+        self.calls.append((query["email"], kwargs))
+        if self.error is not None:
+            raise self.error
+        roles = self.roles_by_email.get(query["email"])
+        return None if roles is None else {"roles": roles}
+
+    def index_information(self):
+        return {"_id_": {}, "email_1": {}}
+
+
+class FakeDB:
+    def __init__(self, perms):
+        self.Admin_Permissions = perms
+
+    def get_collection(self, name, **kwargs):
+        assert name == "Admin_Permissions"
+        return self.Admin_Permissions
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(t=1000.0)
+    monkeypatch.setattr(rbac, "time", SimpleNamespace(monotonic=lambda: now.t))
+    return now
+
+
+@pytest.fixture
+def perms(monkeypatch, clock):
+    perms = FakePermissions({
+        "admin@example.com": ["admin"],
+        "super@example.com": ["super_admin"],
+        "manager@example.com": ["manager"],
+        "viewer@example.com": ["viewer"],
+    })
+    db = FakeDB(perms)
+    monkeypatch.setattr(rbac, "get_db", lambda **kwargs: db)
+    monkeypatch.setattr(rbac, "_INDEXES_CHECKED", False)
+    monkeypatch.setattr(rbac, "_INDEXES_READY", False)
+    monkeypatch.setattr(rbac, "_ROLE_CACHE", {})
+    monkeypatch.delenv("LEADERBOARD_ADMIN_EMAILS", raising=False)
+    monkeypatch.delenv("LEADERBOARD_MANAGER_EMAILS", raising=False)
+    rbac.get_allowed_emails.cache_clear()
+    yield perms
+    rbac.get_allowed_emails.cache_clear()
+
+
+def test_roles_cached_within_ttl(perms, clock):
+    assert rbac._get_user_roles("admin@example.com") == {"admin"}
+    clock.t += rbac.ROLE_CACHE_TTL_S - 1
+    assert rbac._get_user_roles("admin@example.com") == {"admin"}
+    assert len(perms.calls) == 1
+
+
+def test_roles_refetched_after_ttl(perms, clock):
+    rbac._get_user_roles("admin@example.com")
+    perms.roles_by_email["admin@example.com"] = []
+    clock.t += rbac.ROLE_CACHE_TTL_S
+    assert rbac._get_user_roles("admin@example.com") == frozenset()
+    assert len(perms.calls) == 2
+
+
+def test_unknown_user_cached_as_no_roles(perms):
+    assert rbac._get_user_roles("nobody@example.com") == frozenset()
+    assert rbac._get_user_roles("nobody@example.com") == frozenset()
+    assert len(perms.calls) == 1
+
+
+def test_oldest_entry_evicted_at_maxsize(perms, clock, monkeypatch):
+    monkeypatch.setattr(rbac, "ROLE_CACHE_MAXSIZE", 2)
+    for email in ("admin@example.com", "manager@example.com", "viewer@example.com"):
+        rbac._get_user_roles(email)
+        clock.t += 1
+
+    assert list(rbac._ROLE_CACHE) == ["manager@example.com", "viewer@example.com"]
+    rbac._get_user_roles("admin@example.com")
+    assert [email for email, _ in perms.calls].count("admin@example.com") == 2
+
+
+def test_lookup_error_fails_closed_without_caching(perms):
+    perms.error = RuntimeError("primary stepped down")
+    assert rbac._get_user_roles("admin@example.com") == frozenset()
+    assert rbac._ROLE_CACHE == {}
+
+    perms.error = None
+    assert rbac._get_user_roles("admin@example.com") == {"admin"}
+    assert len(perms.calls) == 2
+
+
+def test_db_unavailable_fails_closed(perms, monkeypatch):
+    def no_db(**kwargs):
+        raise Exception("MongoDB Connection String not found")
+    monkeypatch.setattr(rbac, "get_db", no_db)
+    assert not rbac.is_admin("admin@example.com")
+    assert rbac._ROLE_CACHE == {}
+
+
+def test_email_index_hinted_once_known(perms):
+    rbac._get_user_roles("admin@example.com")
+    assert perms.calls[0][1] == {"hint": rbac._EMAIL_INDEX}
+
+
+def test_email_index_not_hinted_when_missing(perms, monkeypatch):
+    monkeypatch.setattr(perms, "index_information", lambda: {"_id_": {}})
+    rbac._get_user_roles("admin@example.com")
+    assert perms.calls[0][1] == {}
+
+
+@pytest.mark.parametrize("email, admin, manager", [
+    ("admin@example.com", True, True),
+    ("super@example.com", True, True),
+    ("manager@example.com", False, True),
+    ("viewer@example.com", False, False),
+    ("nobody@example.com", False, False),
+    ("Admin@Example.com", True, True),
+    ("", False, False),
+])
+def test_role_checks(perms, email, admin, manager):
+    assert rbac.is_admin(email) is admin
+    assert rbac.is_manager(email) is manager
+
+
+def test_env_allow_lists_skip_db(perms, monkeypatch):
+    monkeypatch.setenv("LEADERBOARD_ADMIN_EMAILS", "Boss@Example.com, ")
+    monkeypatch.setenv("LEADERBOARD_MANAGER_EMAILS", "lead@example.com")
+    assert rbac.is_admin("boss@example.com")
+    assert rbac.is_manager("boss@example.com")
+    assert rbac.is_manager("LEAD@example.com")
+    assert not rbac.is_admin("lead@example.com")
+    # only the non-allow-listed admin check hit the DB
+    assert [email for email, _ in perms.calls] == ["lead@example.com"]
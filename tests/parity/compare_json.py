@@ -1,8 +1,26 @@
 
 import json
 import math
+import operator
 from typing import Any, Dict, List, Tuple, Union
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib canonical dumps
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; columnar compare is skipped without it
+    np = None
+
+
+def _canonical_bytes(obj: Any) -> bytes:
+    """Serialize obj with sorted keys so equal documents yield equal bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
 def compare_values(v1: Any, v2: Any, path: str, float_tol: float = 0.01) -> List[str]:
     """
     Compare two values recursively. Return list of error strings.
@@ -37,8 +55,9 @@ def compare_values(v1: Any, v2: Any, path: str, float_tol: float = 0.01) -> List
 
 def compare_dicts(d1: Dict, d2: Dict, path: str, float_tol: float) -> List[str]:
     errors = []
-    keys1 = set(d1.keys())
-    keys2 = set(d2.keys())
+    # Key views are already set-like; no need to copy them into sets.
+    keys1 = d1.keys()
+    keys2 = d2.keys()
 
     # Missing keys
     for k in keys1 - keys2:
@@ -52,7 +71,57 @@ def compare_dicts(d1: Dict, d2: Dict, path: str, float_tol: float) -> List[str]:
 
     return errors
 
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float))
+
+def compare_doc_columns(l1: List[Dict], l2: List[Dict], path: str, float_tol: float) -> Union[List[str], None]:
+    """
+    Columnar (SoA) compare for equal-length lists of docs sharing one keyset.
+    Numeric columns are checked with a single vectorized diff; other columns use
+    list equality and only walk per-row when they differ.
+    Returns None when the lists are not eligible so the caller can fall back.
+    """
+    if np is None or not l1 or len(l1) != len(l2):
+        return None
+    if not isinstance(l1[0], dict):
+        return None
+    keys = l1[0].keys()
+    for d in l1:
+        if not isinstance(d, dict) or d.keys() != keys:
+            return None
+    for d in l2:
+        if not isinstance(d, dict) or d.keys() != keys:
+            return None
+
+    errors = []
+    for k in keys:
+        col1 = [d[k] for d in l1]
+        col2 = [d[k] for d in l2]
+        if col1 == col2:
+            continue
+
+        if all(map(_is_number, col1)) and all(map(_is_number, col2)):
+            try:
+                a1 = np.asarray(col1, dtype=float)
+                a2 = np.asarray(col2, dtype=float)
+            except (OverflowError, ValueError):
+                pass
+            else:
+                diff = np.abs(a1 - a2)
+                for i in np.nonzero(diff > float_tol)[0]:
+                    errors.append(f"{path}[{i}].{k}: {col1[i]} != {col2[i]} (diff {diff[i]} > {float_tol})")
+                continue
+
+        for i, (v1, v2) in enumerate(zip(col1, col2)):
+            errors.extend(compare_values(v1, v2, f"{path}[{i}].{k}", float_tol))
+
+    return errors
+
 def compare_lists(l1: List, l2: List, path: str, float_tol: float) -> List[str]:
+    columnar = compare_doc_columns(l1, l2, path, float_tol)
+    if columnar is not None:
+        return columnar
+
     errors = []
     if len(l1) != len(l2):
         errors.append(f"{path}: Length mismatch ({len(l1)} vs {len(l2)})")
@@ -90,15 +159,57 @@ def compare_snapshots(gold_path: str, actual_path: str) -> List[str]:
                 return x.get("employee_id") or x.get("_id") or str(x)
             return str(x)
 
-        try:
-            gold.sort(key=sort_key)
-            actual.sort(key=sort_key)
-        except:
-            pass # fallback to index based
+        # Fast path: uniform list of docs keyed by employee_id/_id -> C-level itemgetter
+        key_field = None
+        if gold and isinstance(gold[0], dict):
+            if "employee_id" in gold[0]:
+                key_field = "employee_id"
+            elif "_id" in gold[0]:
+                key_field = "_id"
+
+        sorted_fast = False
+        if key_field is not None and isinstance(actual, list):
+            kf = operator.itemgetter(key_field)
+            try:
+                gold.sort(key=kf)
+                actual.sort(key=kf)
+                sorted_fast = True
+            except (KeyError, TypeError):
+                pass # mixed docs; use the general key below
+
+        if not sorted_fast:
+            try:
+                gold.sort(key=sort_key)
+                actual.sort(key=sort_key)
+            except:
+                pass # fallback to index based
 
 
     return compare_values(gold, actual, "ROOT")
 
+def compare_snapshots_fast(gold_path: str, actual_path: str) -> List[str]:
+    """
+    Exact-match comparison for snapshots where float tolerance is not expected.
+    Compares canonical bytes first and only falls back to the structural
+    compare_snapshots walk (for readable diffs) when they differ.
+    """
+    try:
+        with open(gold_path, 'rb') as f:
+            gold = json.load(f)
+    except FileNotFoundError:
+        return [f"Gold file missing: {gold_path}"]
+
+    try:
+        with open(actual_path, 'rb') as f:
+            actual = json.load(f)
+    except FileNotFoundError:
+        return [f"Actual file missing: {actual_path}"]
+
+    if _canonical_bytes(gold) == _canonical_bytes(actual):
+        return []
+
+    return compare_snapshots(gold_path, actual_path)
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 3:
@@ -12,6 +12,15 @@ ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 TOOLS_DIR = os.path.join(ROOT_DIR, "tools")
 ENGINE_DIR = os.path.join(ROOT_DIR, "engine")
 
+def _run_step(label, cmd, env, cwd):
+    """Run a pipeline step, surfacing its output on failure instead of a bare exit code."""
+    try:
+        subprocess.run(cmd, env=env, check=True, capture_output=True, text=True, cwd=cwd, timeout=600)
+    except subprocess.CalledProcessError as e:
+        pytest.fail(f"{label} failed:\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
+    except subprocess.TimeoutExpired as e:
+        pytest.fail(f"{label} timed out after {e.timeout}s")
+
 @pytest.fixture(scope="module")
 def parity_env(tmp_path_factory):
     """
@@ -53,7 +62,7 @@ def parity_env(tmp_path_factory):
         "--scenario", "default",
         "--output-dir", str(python_out)
     ]
-    subprocess.run(cmd_py, env=env, check=True, cwd=ROOT_DIR)
+    _run_step("Python Oracle", cmd_py, env, ROOT_DIR)
 
     # 2. Run TypeScript Engine (Reads seeded DB + Runs logic + Exports)
     # Ensure dependencies are installed or just run via ts-node if possible?
@@ -62,7 +71,7 @@ def parity_env(tmp_path_factory):
     cmd_ts = ["npm", "run", "start"]
 
     # We need to run this from engine dir
-    subprocess.run(cmd_ts, env=env, check=True, cwd=ENGINE_DIR)
+    _run_step("TypeScript Engine", cmd_ts, env, ENGINE_DIR)
 
     return {
         "python": python_out / "default", # export_gold appends scenario name
@@ -3,8 +3,10 @@ import os
 import sys
 import pytest
 import subprocess
-import json
-from compare_json import compare_snapshots
+import filecmp
+import runpy
+from unittest.mock import patch
+from compare_json import compare_snapshots_fast
 
 # Setup Paths
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,12 +18,33 @@ RUNNER_SCRIPT = os.path.join(ROOT_DIR, "tools", "export_gold.py")
 SCENARIOS = ["default", "override_lumpsum", "override_sip"]
 COLLECTIONS = ["Leaderboard_Lumpsum", "MF_SIP_Leaderboard", "Public_Leaderboard"]
 
+def _run_scenarios_inproc(out_base):
+    """
+    Execute export_gold.py as __main__ in-process for all scenarios.
+    env, argv, sys.path and sys.modules are restored afterwards so the runner's
+    imports (reset_seed_v2, the scorers) don't leak into later tests.
+    """
+    saved_argv, saved_path, saved_modules = sys.argv, list(sys.path), set(sys.modules)
+    sys.argv = [RUNNER_SCRIPT, "--scenario", "all", "--output-dir", str(out_base)]
+    try:
+        with patch.dict(os.environ, {"CONFIRM_DROP": "yes"}):
+            runpy.run_path(RUNNER_SCRIPT, run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            pytest.fail(f"Scoring pipeline exited with status {e.code}")
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+
 # Shared fixture to run all scenarios once into a tmp dir
 @pytest.fixture(scope="module")
 def run_all_scenarios(tmp_path_factory):
     """
     Run the scoring pipeline for EACH scenario into a temporary directory
     using SEPARATE subprocesses to ensure isolation.
+    Set PARITY_INPROC=1 to run them in this process instead.
     Returns the base temporary directory containing subdirs for each scenario.
     """
     out_base = tmp_path_factory.mktemp("actual_run")
@@ -34,6 +57,12 @@ def run_all_scenarios(tmp_path_factory):
 
     print(f"\n[Fixture] Running scoring pipelines into {out_base}...")
 
+    if os.environ.get("PARITY_INPROC") == "1":
+        # Run every scenario inside this interpreter so scorer imports and Mongo
+        # connection setup are paid once instead of once per subprocess.
+        _run_scenarios_inproc(out_base)
+        return out_base
+
     for sc in SCENARIOS:
         print(f"  > Subprocess: {sc}")
         cmd = [
@@ -43,9 +72,11 @@ def run_all_scenarios(tmp_path_factory):
             "--output-dir", str(out_base)
         ]
         try:
-            subprocess.run(cmd, env=env, check=True)
+            subprocess.run(cmd, env=env, check=True, capture_output=True, text=True, cwd=ROOT_DIR, timeout=600)
         except subprocess.CalledProcessError as e:
-            pytest.fail(f"Scoring pipeline failed for {sc}: {e}")
+            pytest.fail(f"Scoring pipeline failed for {sc}:\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
+        except subprocess.TimeoutExpired as e:
+            pytest.fail(f"Scoring pipeline timed out for {sc} after {e.timeout}s")
 
     return out_base
 
@@ -63,8 +94,8 @@ def test_identity_parity(run_all_scenarios, scenario, collection):
     assert os.path.exists(gold_path), f"Gold snapshot missing: {scenario}/{collection}"
     assert actual_path.exists(), f"Actual snapshot missing: {scenario}/{collection}"
 
-    # Compare
-    errors = compare_snapshots(str(gold_path), str(actual_path))
+    # Compare (identity: exact bytes first, structural diff only on mismatch)
+    errors = compare_snapshots_fast(str(gold_path), str(actual_path))
     if errors:
         error_msg = "\n".join(errors[:10]) # Show first 10
         if len(errors) > 10:
@@ -79,11 +110,10 @@ def test_override_diffs_lumpsum(run_all_scenarios):
     default_path = run_all_scenarios / "default" / "Leaderboard_Lumpsum.json"
     override_path = run_all_scenarios / "override_lumpsum" / "Leaderboard_Lumpsum.json"
 
-    with open(default_path, 'r') as f: default = json.load(f)
-    with open(override_path, 'r') as f: override = json.load(f)
-
+    # Exports are written deterministically, so differing bytes imply differing docs.
     # We expect differences in Lumpsum calculation (Incentive/Rate changed)
-    assert default != override, "Lumpsum override produced identical Leaderboard_Lumpsum output!"
+    if filecmp.cmp(str(default_path), str(override_path), shallow=False):
+        pytest.fail("Lumpsum override produced identical Leaderboard_Lumpsum output!")
 
     # Note: Lumpsum override (Rate Boost) affects Final Incentive (Payout), not Points.
     # Public_Leaderboard aggregates Points. So it might NOT change.
@@ -96,16 +126,12 @@ def test_override_diffs_sip(run_all_scenarios):
     default_path = run_all_scenarios / "default" / "MF_SIP_Leaderboard.json"
     override_path = run_all_scenarios / "override_sip" / "MF_SIP_Leaderboard.json"
 
-    with open(default_path, 'r') as f: default = json.load(f)
-    with open(override_path, 'r') as f: override = json.load(f)
-
-    assert default != override, "SIP override produced identical MF_SIP_Leaderboard output!"
+    if filecmp.cmp(str(default_path), str(override_path), shallow=False):
+        pytest.fail("SIP override produced identical MF_SIP_Leaderboard output!")
 
     # Verify Public Leaderboard also changed
     default_pub = run_all_scenarios / "default" / "Public_Leaderboard.json"
     override_pub = run_all_scenarios / "override_sip" / "Public_Leaderboard.json"
 
-    with open(default_pub, 'r') as f: d_pub = json.load(f)
-    with open(override_pub, 'r') as f: o_pub = json.load(f)
-
-    assert d_pub != o_pub, "SIP override failed to propagate to Public_Leaderboard!"
+    if filecmp.cmp(str(default_pub), str(override_pub), shallow=False):
+        pytest.fail("SIP override failed to propagate to Public_Leaderboard!")
@@ -40,7 +40,9 @@ echo ""
 echo "Running pytest..."
 echo ""
 
+# Lumpsum and SIP suites are xdist groups; run them on separate workers.
 pytest tests/admin_scorer/test_config_api.py \
+    -n 2 --dist loadgroup \
     -v \
     --tb=short \
     --color=yes \
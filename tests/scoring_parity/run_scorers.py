@@ -8,36 +8,54 @@ Usage:
     python tests/scoring_parity/run_scorers.py [suffix]
 
     If suffix="all", runs default -> snapshot -> override -> snapshot.
+    Set PARITY_GOLD_CACHE=1 to reuse scorer outputs cached for the same seed, config
+    and (clean) git revision.
 
 Safety:
-    Must run against DB_NAME=PLI_Leaderboard_v2
+    Must run against DB_NAME=PLI_Leaderboard_v2 (or a PLI_Leaderboard_v2_* worker copy
+    selected via PARITY_DB_NAME)
 """
 
 import os
 import sys
 import json
+import hashlib
+import orjson
 import logging
+import subprocess
 import traceback
 from datetime import datetime
+from contextlib import contextmanager
+from functools import lru_cache
 from unittest.mock import patch, MagicMock
 import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.database import Database
 
 # Add function app root to path
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "tools"))
+from _mongo import get_mongo_uri
 
-# Safety Check
-MONGO_URI = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGO_URI")
+# Safety Check (same resolution as the seed script, so seeding and scoring hit one cluster)
+MONGO_URI = get_mongo_uri()
 if not MONGO_URI:
     print("ERROR: MongoDb-Connection-String or MONGO_URI must be set")
     sys.exit(1)
 
-TEST_DB_NAME = "PLI_Leaderboard_v2"
+# PARITY_DB_NAME lets parallel (xdist) workers use their own v2 copy, e.g. PLI_Leaderboard_v2_gw0
+TEST_DB_NAME = os.getenv("PARITY_DB_NAME", "PLI_Leaderboard_v2")
+if not TEST_DB_NAME.startswith("PLI_Leaderboard_v2"):
+    print(f"ERROR: Refusing to run against {TEST_DB_NAME}; parity DBs must be PLI_Leaderboard_v2*")
+    sys.exit(1)
 os.environ["DB_NAME"] = TEST_DB_NAME
 os.environ["CORE_DB_NAME"] = TEST_DB_NAME  # Force Lumpsum scorer to read from v2
 os.environ["APP_ENV"] = "test"
 
+# reset_seed_v2 owns the seed fingerprint marker (mark_seed_dirty)
+import reset_seed_v2
+
 # Import scorers (AFTER env vars set to ensure they pick up defaults if any)
 try:
     import Lumpsum_Scorer
@@ -47,44 +65,90 @@ except ImportError as e:
     print(f"ERROR: Could not import scorers. Check sys.path: {sys.path}")
     raise e
 
-# --- V2 Redirect Client ---
-class V2RedirectClient(MongoClient):
-    """Wraps MongoClient to redirect ALL database access to PLI_Leaderboard_v2."""
-    def get_database(self, name=None, codec_options=None, read_preference=None, write_concern=None, read_concern=None):
-        # Redirect mostly everything to TEST_DB_NAME
-        # We can be aggressive here for the test runner.
-        target = TEST_DB_NAME
-        # If no name provided (default db), use test db
-        if name is None:
-             pass
-        # If 'admin' or 'local', maybe keep them? But mostly we want v2.
-        # Let's redirect specific known DBs
-        if name in ["internal", "iwell", "PLI_Leaderboard", "core", "leaderboard"]:
-             target = TEST_DB_NAME
-
-        # Call super with the target name
-        return super().get_database(target, codec_options, read_preference, write_concern, read_concern)
-
-    def __getitem__(self, name):
-        return self.get_database(name)
-
-def run_scoring_iteration(suffix, snapshot_dir=None):
-    """Run full scoring pipeline for Nov 2025."""
-    print(f"\n--- Running Scoring Iteration: {suffix} ---")
-
-    # 1. Connect (using our V2RedirectClient logic implicitly if patched, or explicit here)
-    # Since we patch MongoClient below, calling MongoClient() returns V2RedirectClient-like behavior?
-    # No, patch replaces class.
-    client = MongoClient(MONGO_URI)
-    db = client[TEST_DB_NAME]
-
-    # Verify transaction count in v2
-    txn_count = db.transactions.count_documents({})
-    print(f"DEBUG: db.transactions count in {TEST_DB_NAME}: {txn_count}")
-
-    # TARGET MONTH
-    target_month = "2025-11"
-
+# --- V2 Redirect ---
+@contextmanager
+def redirect_all_databases(target_db):
+    """
+    Route EVERY MongoClient's db lookups (client[name], client.name, get_database) to
+    target_db. Patching the class covers clients the scorers build themselves, and
+    each lookup is a single bound call returning a prebuilt Database.
+    """
+    with patch.object(MongoClient, "__getitem__", lambda self, _name: target_db), \
+         patch.object(MongoClient, "get_database", lambda self, name=None, *args, **kwargs: target_db):
+        yield
+
+# Same layout as json.dump(indent=2, default=str): datetimes go through default=str
+SNAPSHOT_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Non-deterministic fields stripped from scorer outputs before snapshotting
+SNAPSHOT_DROP_FIELDS = ["_id", "updatedAt", "createdAt", "created_at", "updated_at", "config_hash", "AuditMeta"]
+
+def round_top_level_floats(doc, ndigits=2, _float=float, _round=round):
+    """
+    Round float fields of a snapshot doc (top level only; nested values are left
+    as-is so existing gold snapshots stay byte-compatible). BSON doubles decode to
+    exact floats, so an identity type check replaces the isinstance dispatch.
+    """
+    return {k: _round(v, ndigits) if type(v) is _float else v for k, v in doc.items()}
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Single pooled MongoClient shared by every iteration and the override step."""
+    return MongoClient(MONGO_URI, maxPoolSize=50)
+
+# --- Gold Cache (PARITY_GOLD_CACHE=1) ---
+# Scorers are deterministic for a given seed + config + code revision, so their outputs
+# are kept in a side DB (the seed script drops everything in TEST_DB_NAME) and cloned back
+# with $out on a hit instead of re-running the pipeline.
+GOLD_CACHE_DB_NAME = f"{TEST_DB_NAME}__gold_cache"
+GOLD_CACHE_COLLECTIONS = ["Leaderboard_Lumpsum", "MF_SIP_Leaderboard", "Public_Leaderboard", "config"]
+SEED_SCRIPT = os.path.join(ROOT_DIR, "tools", "reset_seed_v2.py")
+
+@lru_cache(maxsize=1)
+def _code_revision():
+    """HEAD SHA for a clean tree, None when dirty/unknown (uncommitted code must not hit the cache)."""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return None if dirty else sha
+
+def gold_cache_key(db):
+    """sha256 over seed script bytes + current config docs + code revision; None disables caching."""
+    revision = _code_revision()
+    if revision is None:
+        return None
+
+    h = hashlib.sha256()
+    with open(SEED_SCRIPT, "rb") as f:
+        h.update(f.read())
+    config = list(db.config.find({}, projection={"updatedAt": 0, "createdAt": 0}).sort("_id", 1))
+    h.update(json.dumps(config, sort_keys=True, default=str).encode())
+    h.update(revision.encode())
+    return h.hexdigest()
+
+def _cache_db(client):
+    # Bypass the redirected get_database, which would send us back to TEST_DB_NAME
+    return Database(client, GOLD_CACHE_DB_NAME)
+
+def restore_gold_cache(client, db, key):
+    cache_db = _cache_db(client)
+    names = [f"{col}_{key}" for col in GOLD_CACHE_COLLECTIONS]
+    existing = set(cache_db.list_collection_names(filter={"name": {"$in": names}}))
+    if len(existing) != len(names):
+        return False
+
+    for col, name in zip(GOLD_CACHE_COLLECTIONS, names):
+        cache_db[name].aggregate([{"$out": {"db": TEST_DB_NAME, "coll": col}}])
+    return True
+
+def store_gold_cache(db, key):
+    for col in GOLD_CACHE_COLLECTIONS:
+        db[col].aggregate([{"$out": {"db": GOLD_CACHE_DB_NAME, "coll": f"{col}_{key}"}}])
+
+def run_pipeline(db, client, target_month):
+    """Run Lumpsum, SIP and Leaderboard aggregation for target_month."""
     # 2. Run Lumpsum Scorer
     print(f"Running Lumpsum Scorer for {target_month}...")
     try:
@@ -126,6 +190,35 @@ def run_scoring_iteration(suffix, snapshot_dir=None):
         print(f"ERROR: Leaderboard aggregation failed: {e}")
         traceback.print_exc()
 
+def run_scoring_iteration(suffix, snapshot_dir=None):
+    """Run full scoring pipeline for Nov 2025."""
+    print(f"\n--- Running Scoring Iteration: {suffix} ---")
+
+    # 1. Connect (shared client; avoids a fresh handshake per iteration)
+    client = get_client()
+    db = client[TEST_DB_NAME]
+
+    # Verify transaction count in v2
+    txn_count = db.transactions.estimated_document_count()
+    print(f"DEBUG: db.transactions count in {TEST_DB_NAME}: {txn_count}")
+
+    # TARGET MONTH
+    target_month = "2025-11"
+
+    # Outputs written below dirty the seeded DB; clear reset_seed_v2's fingerprint marker
+    # so a later seed_data(skip_if_current=True) reseeds
+    reset_seed_v2.mark_seed_dirty(db)
+
+    # 2-4. Run scorers, or restore their outputs from the gold cache
+    cache_key = gold_cache_key(db) if os.getenv("PARITY_GOLD_CACHE") == "1" else None
+    if cache_key and restore_gold_cache(client, db, cache_key):
+        print(f"Gold cache hit ({cache_key[:12]}): restored scorer outputs, skipping scorers")
+    else:
+        run_pipeline(db, client, target_month)
+        if cache_key:
+            store_gold_cache(db, cache_key)
+            print(f"Gold cache stored ({cache_key[:12]})")
+
     # 5. Snapshot Outputs
     if snapshot_dir is None:
         snapshot_dir = os.getenv("SNAPSHOT_DIR") or os.path.join(os.path.dirname(__file__), "snapshots")
@@ -137,49 +230,52 @@ def run_scoring_iteration(suffix, snapshot_dir=None):
         if col_name == "config":
              query = {"_id": "Leaderboard_Lumpsum"}
         else:
-             if db[col_name].count_documents({"month": target_month}) > 0:
-                 query = {"month": target_month}
-             elif db[col_name].count_documents({"period_month": target_month}) > 0:
-                 query = {"period_month": target_month}
-             else:
-                 query = {"month": target_month}
-
-        docs = list(db[col_name].find(query))
-
-        docs.sort(key=lambda x: x.get("employee_id", "") or x.get("_id", ""))
-
-        normalized = []
-        for d in docs:
-            if col_name != "config":
-                d.pop("_id", None)
-                d.pop("updatedAt", None)
-                d.pop("createdAt", None)
-                d.pop("created_at", None)
-                d.pop("updated_at", None)
-                d.pop("config_hash", None)
-                d.pop("AuditMeta", None)
-            else:
-                d.pop("updatedAt", None)
-
-            for k, v in d.items():
-                if isinstance(v, float):
-                    d[k] = round(v, 2)
-
-            normalized.append(d)
+             # Outputs key the month as either `month` or `period_month`; one query covers both
+             query = {"$or": [{"month": target_month}, {"period_month": target_month}]}
+
+        # Trim non-deterministic fields server-side so they never cross the wire
+        drop_fields = ["updatedAt"] if col_name == "config" else SNAPSHOT_DROP_FIELDS
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"employee_id": 1, "_id": 1}},
+            {"$unset": drop_fields},
+        ]
+
+        normalized = [round_top_level_floats(d) for d in db[col_name].aggregate(pipeline, allowDiskUse=True)]
 
         out_file = os.path.join(snapshot_dir, f"{col_name}_{suffix}.json")
-        with open(out_file, "w") as f:
-            json.dump(normalized, f, indent=2, default=str)
+        with open(out_file, "wb") as f:
+            f.write(orjson.dumps(normalized, option=SNAPSHOT_JSON_OPTS, default=str))
         print(f"Saved snapshot: {out_file} ({len(normalized)} records)")
 
-if __name__ == "__main__":
+# Config overrides for the "override" iteration: config _id -> $set payload
+OVERRIDE_CONFIG = {
+    "Leaderboard_Lumpsum": {
+        "rate_slabs": [
+            {"min_pct": 2.0, "rate": 1.0, "label": "Test Boost"}, # 100% rate!
+            {"min_pct": 0.0, "max_pct": 2.0, "rate": 0.0, "label": "<2%"}
+        ],
+        "version": 999,
+    },
+}
+
+def apply_config_overrides(db, overrides):
+    """Upsert all config overrides in one bulk_write round-trip."""
+    ops = [UpdateOne({"_id": cfg_id}, {"$set": fields}, upsert=True) for cfg_id, fields in overrides.items()]
+    if ops:
+        db.config.bulk_write(ops, ordered=False)
+
+def main(argv=None):
+    """Entry point; argv mirrors sys.argv[1:] (e.g. ["all"]). Callable in-process by tests."""
+    if argv is None:
+        argv = sys.argv[1:]
     logging.basicConfig(level=logging.WARNING)
-    arg = sys.argv[1] if len(sys.argv) > 1 else "default"
+    arg = argv[0] if argv else "default"
 
     # GLOBAL PATCH: MongoClient
-    # This ensures ANY module creating a new MongoClient(uri) gets our RedirectClient
+    # This ensures ANY MongoClient (including ones scorers create) resolves to the test DB
     # This fixes SIP_Scorer connecting to prod DB for output.
-    with patch('pymongo.MongoClient', side_effect=V2RedirectClient):
+    with redirect_all_databases(get_client().get_database(TEST_DB_NAME)):
         # Additional safe patch for SIP transaction collection
         SIP_Scorer._tx_coll = lambda client: client[TEST_DB_NAME]["transactions"]
 
@@ -187,22 +283,16 @@ if __name__ == "__main__":
             run_scoring_iteration("default")
 
             print("\n>>> Applying Config Override (Rate Slab 2.0% -> 100.0%)")
-            # We must use V2RedirectClient explicitly here if inside patch, or just client path
-            client = MongoClient(MONGO_URI)
+            client = get_client()
             db = client[TEST_DB_NAME]
 
-            override_slabs = [
-                {"min_pct": 2.0, "rate": 1.0, "label": "Test Boost"}, # 100% rate!
-                {"min_pct": 0.0, "max_pct": 2.0, "rate": 0.0, "label": "<2%"}
-            ]
-            db.config.update_one(
-                {"_id": "Leaderboard_Lumpsum"},
-                {"$set": {"rate_slabs": override_slabs, "version": 999}},
-                upsert=True
-            )
+            apply_config_overrides(db, OVERRIDE_CONFIG)
             print("db.config updated.")
 
             run_scoring_iteration("override")
 
         else:
             run_scoring_iteration(arg)
+
+if __name__ == "__main__":
+    main()
@@ -16,21 +16,41 @@ if not MONGO_URI_ENV:
     pytest.skip("Skipping scoring parity tests: Env var MongoDb-Connection-String not set", allow_module_level=True)
 
 SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
-
-def test_scoring_parity_e2e(tmp_path):
+COLLECTIONS = ["Leaderboard_Lumpsum", "MF_SIP_Leaderboard", "Public_Leaderboard"]
+
+# run_scorers.py argument -> snapshot suffixes it produces
+SCENARIOS = {
+    "default": ["default"],
+    "all": ["default", "override"],
+}
+
+def _parity_db_name():
+    """Per-worker DB so scenarios can run in parallel under pytest-xdist (-n auto)."""
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    return f"PLI_Leaderboard_v2_{worker}" if worker else "PLI_Leaderboard_v2"
+
+# Seed + score in ONE fresh interpreter: both modules read env at import time, and a
+# separate process also isolates run_scorers' global MongoClient patch.
+_SEED_AND_SCORE = """
+import sys
+sys.path[:0] = sys.argv[1:3]
+import reset_seed_v2
+import run_scorers
+reset_seed_v2.seed_data()
+run_scorers.main(sys.argv[3:])
+"""
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_scoring_parity_e2e(tmp_path, scenario):
     """
-    Run the full scoring pipeline via subprocess (for isolation) and compare output snapshots
+    Run the full scoring pipeline in a child interpreter (for isolation) and compare output snapshots
     against the committed 'Gold' snapshots.
     """
     output_dir = tmp_path / "output"
     output_dir.mkdir()
 
     # Define Gold Files to check
-    gold_files = [
-        "Leaderboard_Lumpsum_default.json",
-        "MF_SIP_Leaderboard_default.json",
-        "Public_Leaderboard_default.json"
-    ]
+    gold_files = [f"{col}_{suffix}.json" for suffix in SCENARIOS[scenario] for col in COLLECTIONS]
 
     # Verify Gold files exist
     for f in gold_files:
@@ -41,40 +61,27 @@ def test_scoring_parity_e2e(tmp_path):
     env["MONGODB_CONNECTION_STRING"] = MONGO_URI_ENV
     env["CONFIRM_DROP"] = "yes"
     env["PYTHONPATH"] = ROOT_DIR
-
-    # 1. Run Seed Script
-    print("Seeding DB...")
-    seed_script = os.path.join(ROOT_DIR, "tools", "reset_seed_v2.py")
-    subprocess.run([sys.executable, seed_script], env=env, check=True)
-
-    # 2. Run Scorers Script
-    # We need to tell run_scorers to output to our tempt path.
-    # Note: run_scorers.py as currently written outputs to hardcoded "snapshots" (unless I update it to parse arg?)
-    # I modified run_scoring_iteration to accept arg, but __main__ block in run_scorers.py calls it with default?
-    # Let's check run_scorers.py __main__ block.
-    # If it defaults to 'snapshots' dir, I should copy the result from there?
-    # Or modify run_scorers.py to accept an output dir arg.
-    # For now, let's assume it writes to `tests/scoring_parity/snapshots`.
-    # But wait, that will overwrite GOLD if I run it!
-
-    # Critical: I must backup GOLD or modify run_scorers.py to accept CLI arg for output dir.
-    # I'll rely on git/manual restore if I overwrite for now, OR I simply verify the content of the file it produces.
-    # Actually, running it overwrites the files I'm comparing against.
-
-    # Better: Use a context manager to backup and restore gold files?
-    # Or pass output dir via env var?
-    pass
-
-    # Let's Modify run_scorers.py to accept SNAPSHOT_DIR env var or arg.
-    # run_scorers.py:
-    # if snapshot_dir is None:
-    #    snapshot_dir = os.path.join(...)
-
-    # I should update run_scorers.py to check env var SNAPSHOT_DIR.
+    env["PARITY_DB_NAME"] = _parity_db_name()
 
     env["SNAPSHOT_DIR"] = str(output_dir)
-    runner_script = os.path.join(ROOT_DIR, "tests", "scoring_parity", "run_scorers.py")
-    subprocess.run([sys.executable, runner_script, "default"], env=env, check=True)
+
+    # 1+2. Seed DB and run scorers in one subprocess: a single interpreter/pymongo
+    # cold start instead of one per step.
+    print("Seeding DB and running scorers...")
+    cmd = [
+        sys.executable, "-c", _SEED_AND_SCORE,
+        os.path.join(ROOT_DIR, "tools"), os.path.dirname(os.path.abspath(__file__)),
+        scenario,
+    ]
+    try:
+        result = subprocess.run(cmd, env=env, cwd=ROOT_DIR, capture_output=True, text=True, timeout=600)
+    except subprocess.TimeoutExpired as e:
+        pytest.fail(f"Seed + scoring timed out for {scenario}\nSTDOUT:\n{e.stdout}\nSTDERR:\n{e.stderr}")
+    if result.returncode != 0:
+        pytest.fail(
+            f"Seed + scoring failed for {scenario} (exit code {result.returncode})\n"
+            f"STDOUT:\n{result.stdout}\nSTDERR:\n{result.stderr}"
+        )
 
     # Compare
     for filename in gold_files:
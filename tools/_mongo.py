@@ -0,0 +1,58 @@
+"""
+Shared MongoDB client for tool scripts.
+
+Every tool used to build its own MongoClient, paying SRV resolution, TLS and
+topology discovery each time. Scripts (and runners that import several of
+them in one process) should call get_client() so the pooled client is reused.
+"""
+
+import os
+from functools import lru_cache
+from pymongo import MongoClient
+
+
+def get_mongo_uri():
+    """
+    MONGODB_SEEDLIST_URI, when set, is a pre-resolved mongodb://host1,host2/?replicaSet=...&tls=true
+    form of the Atlas mongodb+srv:// URI; using it skips the SRV/TXT DNS lookups on connect.
+    """
+    return (
+        os.getenv("MONGODB_SEEDLIST_URI")
+        or os.getenv("MONGODB_CONNECTION_STRING")
+        or os.getenv("MONGO_URI")
+        or os.getenv("MONGODB_URI")
+    )
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Return the process-wide MongoClient for MONGODB_CONNECTION_STRING / MONGO_URI."""
+    return MongoClient(get_mongo_uri(), maxPoolSize=50)
+
+
+@lru_cache(maxsize=1)
+def get_read_client():
+    """
+    Client for read-only inspector scripts: reads may go to a secondary, the wire is
+    zlib-compressed (stdlib; zstd/snappy would need extra packages) and an
+    unreachable cluster fails fast instead of after the 30s default.
+    """
+    return MongoClient(
+        get_mongo_uri(),
+        compressors="zlib",
+        readPreference="secondaryPreferred",
+        serverSelectionTimeoutMS=5000,
+        maxPoolSize=10,
+    )
+
+
+def ensure_indexes(coll, indexes):
+    """
+    create_indexes() for only those IndexModels whose key pattern is not already on coll.
+    One listIndexes round-trip replaces a createIndexes call per existing index.
+    """
+    existing = {tuple(ix["key"].items()) for ix in coll.list_indexes()}
+    missing = [ix for ix in indexes if tuple(ix.document["key"].items()) not in existing]
+    if missing:
+        coll.create_indexes(missing)
+    return missing
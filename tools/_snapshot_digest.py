@@ -0,0 +1,45 @@
+"""
+Canonical digests for JSON snapshot files (gold exports and engine artifacts).
+
+A snapshot's digest is the sha256 of its contents re-encoded with sorted keys, so
+two files holding equal documents hash the same regardless of formatting.
+"""
+
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib canonical dumps
+    orjson = None
+
+
+def canonical_bytes(obj):
+    """Serialize obj with sorted keys so equal documents yield equal bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
+
+def snapshot_digest(path):
+    """sha256 of the canonical (sorted-key) encoding of a snapshot file's contents."""
+    with open(path, "rb") as f:
+        data = json.load(f)
+    return hashlib.sha256(canonical_bytes(data)).hexdigest()
+
+
+def write_snapshot_digest(path):
+    """Write snapshot_digest(path) to the `<path>.sha256` sidecar and return it."""
+    digest = snapshot_digest(path)
+    with open(path + ".sha256", "w") as f:
+        f.write(digest + "\n")
+    return digest
+
+
+def read_snapshot_digest(path):
+    """The digest recorded in the `<path>.sha256` sidecar, or None if there is none."""
+    try:
+        with open(path + ".sha256") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of Zoho_Users.employee_id_str ($toString of `id`), the join key of the
+public leaderboard's Zoho_Users $lookup, plus its index.
+
+Scans the whole collection, so it is not part of Leaderboard.run: run it once per DB, and
+again after a Zoho sync that brings in new users (Leaderboard.run logs a warning when it
+finds users without the key).
+
+Usage:
+    PLI_DB_NAME=PLI_Leaderboard python tools/backfill_zoho_lookup_key.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _mongo import get_client, get_mongo_uri
+from Leaderboard import ensure_zoho_lookup_key
+
+
+def main():
+    if not get_mongo_uri():
+        print("Error: Mongo URI missing")
+        sys.exit(1)
+
+    db_name = os.getenv("PLI_DB_NAME", "PLI_Leaderboard")
+    db = get_client()[db_name]
+    modified = ensure_zoho_lookup_key(db)
+    print(f"{db_name}.Zoho_Users: employee_id_str set on {modified} docs; index ensured.")
+
+
+if __name__ == "__main__":
+    main()
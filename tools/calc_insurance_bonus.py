@@ -1,10 +1,10 @@
-from pymongo import MongoClient
+import sys
+import textwrap
 from datetime import datetime
-import json
-import os
+import orjson
+from _mongo import get_client
 
-CONN = os.getenv("MONGODB_CONNECTION_STRING")
-c = MongoClient(CONN)
+c = get_client()
 db_v2 = c['PLI_Leaderboard_v2']
 
 print("Calculating Insurance Bonus Breakdown for Dec 2025 (Q3: Oct-Dec)...")
@@ -13,7 +13,14 @@ print("Calculating Insurance Bonus Breakdown for Dec 2025 (Q3: Oct-Dec)...")
 q_start = datetime(2025, 10, 1)
 q_end = datetime(2026, 1, 1) # Exclusive
 
-# Fetch all Q3 records
+dec_start = datetime(2025, 12, 1)
+dec_end = q_end
+
+# Range scans on renewal_date use the (renewal_date, employee_id) index from
+# tools/init_report_indexes.py
+
+# Fetch all Q3 records once; the December subset is re-matched inside its own facet
+# instead of evaluating a $cond for every Q3 document.
 pipeline = [
     {
         "$match": {
@@ -21,47 +28,69 @@ pipeline = [
         }
     },
     {
-        "$group": {
-            "_id": "$employee_id",
-            "employee_name": {"$first": "$employee_name"},
-            "q_fresh_premium": {"$sum": "$fresh_premium_eligible"},
-            "q_total_points": {"$sum": "$total_points"},
-            "dec_points": {
-                "$sum": {
-                    "$cond": [
-                        {"$and": [{"$gte": ["$renewal_date", datetime(2025, 12, 1)]}, {"$lt": ["$renewal_date", datetime(2026, 1, 1)]}]},
-                        "$total_points",
-                        0
-                    ]
+        "$facet": {
+            "quarterly": [
+                {
+                    "$group": {
+                        "_id": "$employee_id",
+                        "employee_name": {"$first": "$employee_name"},
+                        "q_fresh_premium": {"$sum": "$fresh_premium_eligible"},
+                        "q_total_points": {"$sum": "$total_points"}
+                    }
+                },
+                {
+                    # Quarterly bonus slabs on fresh premium, bucketed server-side
+                    "$addFields": {
+                        "quarterly_bonus": {
+                            "$switch": {
+                                "branches": [
+                                    {"case": {"$gte": ["$q_fresh_premium", 2_500_000]}, "then": 31_000},
+                                    {"case": {"$gte": ["$q_fresh_premium", 2_000_000]}, "then": 17_500},
+                                    {"case": {"$gte": ["$q_fresh_premium", 1_700_000]}, "then": 9000},
+                                    {"case": {"$gte": ["$q_fresh_premium", 1_500_000]}, "then": 3200},
+                                ],
+                                "default": 0
+                            }
+                        }
+                    }
                 }
-            }
+            ],
+            "december": [
+                {"$match": {"renewal_date": {"$gte": dec_start, "$lt": dec_end}}},
+                {"$group": {"_id": "$employee_id", "dec_points": {"$sum": "$total_points"}}}
+            ]
         }
     }
 ]
 
-def get_q_bonus(fresh_premium):
-    fp = float(fresh_premium or 0)
-    if 1_500_000 <= fp < 1_700_000: return 3200
-    if 1_700_000 <= fp < 2_000_000: return 9000
-    if 2_000_000 <= fp < 2_500_000: return 17_500
-    if fp >= 2_500_000: return 31_000
-    return 0
+def iter_results(facets):
+    dec_points_by_emp = {d["_id"]: d["dec_points"] for d in facets["december"]}
 
-results = []
-agg = list(db_v2.Insurance_Policy_Scoring.aggregate(pipeline))
+    for r in facets["quarterly"]:
+        q_fresh = r.get('q_fresh_premium', 0)
+        q_bonus = r.get('quarterly_bonus', 0)
+        dec_points = dec_points_by_emp.get(r.get('_id'), 0)
+
+        yield {
+            "Employee": r.get('employee_name', 'Unknown'),
+            "ID": r.get('_id'),
+            "Q3_Fresh_Premium": round(q_fresh, 2),
+            "Quarterly_Bonus": q_bonus,
+            "Dec_Points": round(dec_points, 2),
+            "Total_Payout_Impact": round(dec_points + q_bonus, 2)
+        }
 
-for r in agg:
-    q_fresh = r.get('q_fresh_premium', 0)
-    q_bonus = get_q_bonus(q_fresh)
+def write_json_array(rows, out):
+    """Stream rows as a JSON array laid out like json.dumps(rows, indent=2), one row at a time."""
+    out.write("[")
+    wrote_any = False
+    for row in rows:
+        out.write(",\n" if wrote_any else "\n")
+        out.write(textwrap.indent(orjson.dumps(row, option=orjson.OPT_INDENT_2).decode(), "  "))
+        wrote_any = True
+    out.write("\n]\n" if wrote_any else "]\n")
 
-    results.append({
-        "Employee": r.get('employee_name', 'Unknown'),
-        "ID": r.get('_id'),
-        "Q3_Fresh_Premium": round(q_fresh, 2),
-        "Quarterly_Bonus": q_bonus,
-        "Dec_Points": round(r.get('dec_points', 0), 2),
-        "Total_Payout_Impact": round(r.get('dec_points', 0) + q_bonus, 2)
-    })
+facets = next(db_v2.Insurance_Policy_Scoring.aggregate(pipeline), {"quarterly": [], "december": []})
 
 # Output JSON
-print(json.dumps(results, indent=2))
+write_json_array(iter_results(facets), sys.stdout)
@@ -1,11 +1,10 @@
 
 import os
-from pymongo import MongoClient
+from _mongo import get_client
 
-MONGO_URI = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGO_URI")
 DB_NAME = os.getenv("DB_NAME", "PLI_Leaderboard_v2")
 
-client = MongoClient(MONGO_URI)
+client = get_client()
 db = client[DB_NAME]
 
 print(f"DB_NAME: {DB_NAME}")
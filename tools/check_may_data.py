@@ -1,11 +1,9 @@
 
-import os
-import pymongo
+from _mongo import get_read_client
 
 def check_may_data():
     try:
-        # client = pymongo.MongoClient(os.getenv("MONGODB_CONNECTION_STRING"))
-        client = pymongo.MongoClient(os.getenv("MONGODB_CONNECTION_STRING"))
+        client = get_read_client()
         db = client["PLI_Leaderboard_v2"]
 
         print(f"Connected to {db.name}")
@@ -31,7 +29,7 @@ def check_may_data():
         print(f"MF_SIP_Leaderboard count for 2025-05: {s_count}")
 
         # Check Zoho_Users count
-        u_count = db.Zoho_Users.count_documents({})
+        u_count = db.Zoho_Users.estimated_document_count()
         print(f"Zoho_Users count: {u_count}")
 
     except Exception as e:
@@ -1,10 +1,12 @@
-import os
-import pymongo
-import json
+import orjson
 from bson import json_util
+from _mongo import get_read_client
 
-uri = os.getenv("MONGODB_CONNECTION_STRING")
-client = pymongo.MongoClient(uri)
+# json_util keeps Extended JSON for ObjectId/datetime, orjson does the encoding
+def dumps(doc):
+    return orjson.dumps(doc, default=json_util.default, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME).decode()
+
+client = get_read_client()
 db = client["PLI_Leaderboard"]
 
 eid = "2969103000000183019" # Sagar Maini
@@ -15,13 +17,13 @@ print(f"--- Checking for EID: {eid} Month: {month} ---")
 print("\n[MF_SIP_Leaderboard]")
 sip = db.MF_SIP_Leaderboard.find_one({"period_month": month, "employee_id": eid})
 if sip:
-    print(json.dumps(sip, default=json_util.default, indent=2))
+    print(dumps(sip))
 else:
     print("No SIP Record found.")
 
 print("\n[Leaderboard_Lumpsum]")
 ls = db.Leaderboard_Lumpsum.find_one({"month": month, "employee_id": eid})
 if ls:
-    print(json.dumps(ls, default=json_util.default, indent=2))
+    print(dumps(ls))
 else:
     print("No Lumpsum Record found.")
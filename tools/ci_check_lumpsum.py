@@ -11,6 +11,9 @@ except ImportError:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from tests.parity.compare_json import compare_snapshots
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from _snapshot_digest import read_snapshot_digest, snapshot_digest
+
 def main():
     gold_path = 'gold/2025-11/default/Leaderboard_Lumpsum.json'
     engine_path = 'engine_artifacts/Leaderboard_Lumpsum.json'
@@ -22,6 +25,21 @@ def main():
         print(f"Engine file not found: {engine_path}")
         sys.exit(1)
 
+    # The gold digest is always computed from the gold JSON itself; a committed sidecar that
+    # disagrees means the gold file was edited without re-exporting it
+    gold_digest = snapshot_digest(gold_path)
+    gold_sidecar = read_snapshot_digest(gold_path)
+    if gold_sidecar is not None and gold_sidecar != gold_digest:
+        print(f"Stale digest sidecar: {gold_path}.sha256 does not match {gold_path}; re-run tools/export_gold.py")
+        sys.exit(1)
+
+    # Byte-identical canonical content needs no structured diff (the engine sidecar is written
+    # by ci_export_lumpsum.py in the same job)
+    engine_digest = read_snapshot_digest(engine_path) or snapshot_digest(engine_path)
+    if gold_digest == engine_digest:
+        print('✅ SUCCESS: TS Engine Lumpsum output matches Gold (Default)! (digest match)')
+        sys.exit(0)
+
     errors = compare_snapshots(gold_path, engine_path)
 
     if not errors:
@@ -1,8 +1,27 @@
 import sys
 import os
-import json
+import hashlib
+import orjson
 from pymongo import MongoClient
 
+# Normalize (remove _id, timestamps, etc.)
+IGNORE_FIELDS = frozenset({'_id', 'createdAt', 'created_at', 'updatedAt', 'updated_at', 'updated_at_audit', 'version', '__v', 'config_hash', 'AuditMeta'})
+_ignored = IGNORE_FIELDS.__contains__
+_CONTAINERS = (dict, list)
+
+
+def normalize(val):
+    # Only recurse into containers; scalar leaves are copied as-is without a call frame.
+    if isinstance(val, dict):
+        return {
+            k: normalize(v) if isinstance(v, _CONTAINERS) else v
+            for k, v in val.items() if not _ignored(k)
+        }
+    if isinstance(val, list):
+        return [normalize(v) if isinstance(v, _CONTAINERS) else v for v in val]
+    return val
+
+
 def main():
     uri = os.environ.get('MONGO_URI')
     if not uri:
@@ -13,26 +32,30 @@ def main():
     db = client.PLI_Leaderboard_v2
 
     # Export __engine__Leaderboard_Lumpsum
-    docs = list(db['__engine__Leaderboard_Lumpsum'].find({}))
-
-    # Normalize (remove _id, timestamps, etc.)
-    IGNORE_FIELDS = {'_id', 'createdAt', 'created_at', 'updatedAt', 'updated_at', 'updated_at_audit', 'version', '__v', 'config_hash', 'AuditMeta'}
-
-    def normalize(val):
-        if val is None or val == '':
-            return val
-        if isinstance(val, list):
-            return [normalize(v) for v in val]
-        if isinstance(val, dict):
-            return {k: normalize(v) for k, v in val.items() if k not in IGNORE_FIELDS}
-        return val
+    # Top-level ignored fields are excluded server-side; normalize() still strips nested ones.
+    # The server also returns rows in (employee_id, month) order, so no Python sort key runs.
+    docs = db['__engine__Leaderboard_Lumpsum'].find(
+        {}, projection=dict.fromkeys(IGNORE_FIELDS, 0)
+    ).sort([('employee_id', 1), ('month', 1), ('_id', 1)])
 
     normalized = [normalize(doc) for doc in docs]
-    normalized.sort(key=lambda x: (x.get('employee_id') or '', x.get('month') or ''))
 
     os.makedirs('engine_artifacts', exist_ok=True)
-    with open('engine_artifacts/Leaderboard_Lumpsum.json', 'w') as f:
-        json.dump(normalized, f, indent=2, default=str, sort_keys=True)
+    with open('engine_artifacts/Leaderboard_Lumpsum.json', 'wb') as f:
+        f.write(orjson.dumps(
+            normalized,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            default=str
+        ))
+
+    # Same canonical encoding as _snapshot_digest.snapshot_digest, so ci_check can skip the diff on a match
+    digest = hashlib.sha256(orjson.dumps(
+        normalized,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        default=str
+    )).hexdigest()
+    with open('engine_artifacts/Leaderboard_Lumpsum.json.sha256', 'w') as f:
+        f.write(digest + '\n')
 
     print(f'Exported {len(normalized)} records from __engine__Leaderboard_Lumpsum')
 
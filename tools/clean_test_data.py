@@ -12,11 +12,13 @@ db = client["PLI_Leaderboard_v2"]
 
 print(f"Connected to {db.name}")
 
+# Seeded fixture names all start with "Test"/"TEST" (see reset_seed_v2.py); anchoring the
+# match keeps real names that merely contain "test" safe and lets the regex stop early.
 query = {"$or": [
-    {"RM_Name": {"$regex": "Test", "$options": "i"}},
-    {"NameOfEmp": {"$regex": "Test", "$options": "i"}},
-    {"name": {"$regex": "Test", "$options": "i"}},
-    {"rm_name": {"$regex": "Test", "$options": "i"}}
+    {"RM_Name": {"$regex": "^Test", "$options": "i"}},
+    {"NameOfEmp": {"$regex": "^Test", "$options": "i"}},
+    {"name": {"$regex": "^Test", "$options": "i"}},
+    {"rm_name": {"$regex": "^Test", "$options": "i"}}
 ]}
 
 # Verify count before delete
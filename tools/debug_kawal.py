@@ -1,19 +1,25 @@
 
-import pymongo
-import os
-import pprint
+import sys
+import orjson
+from _mongo import get_read_client
+
+# Debug output only needs a handful of matches
+MAX_DOCS = 5
+
+def dump_doc(doc):
+    sys.stdout.write(orjson.dumps(doc, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE).decode())
 
 def debug_kawal():
-    client = pymongo.MongoClient(os.getenv("MONGODB_CONNECTION_STRING"))
+    client = get_read_client()
     db = client["PLI_Leaderboard_v2"]
 
     print("--- Public_Leaderboard (May 2025) ---")
-    # Fuzzy search for Kawal
+    # Prefix search for Kawal (anchored so the regex can bail out after the first chars)
     query = {
         "period_month": "2025-05",
-        "rm_name": {"$regex": "Kawal", "$options": "i"}
+        "rm_name": {"$regex": "^Kawal", "$options": "i"}
     }
-    cursor = db.Public_Leaderboard.find(query)
+    cursor = db.Public_Leaderboard.find(query).limit(MAX_DOCS)
     found_bs = False
     for doc in cursor:
         found_bs = True
@@ -29,16 +35,16 @@ def debug_kawal():
     print("\n--- Zoho_Users (Kawal) ---")
     z_query = {
         "$or": [
-            {"Full Name": {"$regex": "Kawal", "$options": "i"}},
-            {"Name": {"$regex": "Kawal", "$options": "i"}},
-            {"Email": {"$regex": "kawal", "$options": "i"}}
+            {"Full Name": {"$regex": "^Kawal", "$options": "i"}},
+            {"Name": {"$regex": "^Kawal", "$options": "i"}},
+            {"Email": {"$regex": "^kawal", "$options": "i"}}
         ]
     }
-    z_cursor = db.Zoho_Users.find(z_query)
+    z_cursor = db.Zoho_Users.find(z_query).limit(MAX_DOCS)
     found_zoho = False
     for doc in z_cursor:
         found_zoho = True
-        pprint.pprint(doc)
+        dump_doc(doc)
 
     if not found_zoho:
         print("No Zoho User found for Kawal")
@@ -52,15 +52,13 @@ pipeline_prefix = [stage1, stage2, stage6]
 count6 = len(list(db.MF_SIP_Leaderboard.aggregate(pipeline_prefix)))
 print(f"Stage 6 (Group SIP-only): {count6} records")
 
-# STAGE 8: LOOKUP ZOHO
+# STAGE 8: LOOKUP ZOHO (on the materialised employee_id_str, as Leaderboard does;
+# run tools/backfill_zoho_lookup_key.py first if older Zoho_Users docs lack it)
 stage8 = {
     "$lookup": {
         "from": "Zoho_Users",
-        "let": {"emp": {"$toString": "$_id.employee_id"}},
-        "pipeline": [
-            {"$match": {"$expr": {"$eq": [{"$toString": "$id"}, "$$emp"]}}},
-            {"$project": {"status": "$status", "active": "$active"}} # limited fields for debug
-        ],
+        "localField": "_id.employee_id",
+        "foreignField": "employee_id_str",
         "as": "zu",
     }
 }
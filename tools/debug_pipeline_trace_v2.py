@@ -3,6 +3,7 @@ import pymongo
 import os
 import sys
 import datetime
+import orjson
 from bson.son import SON
 
 # Add parent to path
@@ -32,7 +33,7 @@ try:
 
     if len(results) > 0:
         print("First doc:")
-        print(results[0])
+        print(orjson.dumps(results[0], default=str, option=orjson.OPT_INDENT_2).decode())
     else:
         print("No results found.")
 
@@ -1,11 +1,12 @@
-from pymongo import MongoClient
+from _mongo import get_read_client
 from datetime import datetime
-import os
 
-CONN = os.getenv("MONGODB_CONNECTION_STRING")
-c = MongoClient(CONN)
+c = get_read_client()
 db_v2 = c['PLI_Leaderboard_v2']
 
+# The name + date-range $match is served by the (employee_name, renewal_date) index
+# from tools/init_report_indexes.py
+
 print("Explaining Points for Rohit Bhardwaj (Dec 2025)...")
 
 pipeline = [
@@ -27,7 +28,7 @@ pipeline = [
     }
 ]
 
-res = list(db_v2.Insurance_Policy_Scoring.aggregate(pipeline))
+res = list(db_v2.Insurance_Policy_Scoring.aggregate(pipeline, batchSize=500))
 total = 0
 for r in res:
     print(f"Policy: {r.get('policy_number')} | Date: {r.get('renewal_date')} | Type: {r.get('policy_type')} | Points: {r.get('total_points')} (Base: {r.get('base_points')}) | FreshPrem: {r.get('fresh_premium_eligible')}")
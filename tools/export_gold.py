@@ -1,11 +1,13 @@
 
 import os
 import sys
-import json
+import orjson
 import shutil
+import textwrap
 import logging
 import traceback
 from datetime import datetime
+from contextlib import contextmanager
 from unittest.mock import patch
 import pymongo
 from pymongo import MongoClient
@@ -17,10 +19,14 @@ sys.path.append(os.path.join(ROOT_DIR, "tools"))
 
 # Import Seed Script
 import reset_seed_v2
+from _mongo import get_client, get_mongo_uri
+from _snapshot_digest import write_snapshot_digest
 
 # Database Constants
-TEST_DB_NAME = "PLI_Leaderboard_v2"
-MONGO_URI = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGO_URI")
+TEST_DB_NAME = reset_seed_v2.DB_NAME  # PLI_Leaderboard_v2, or the PARITY_DB_NAME worker copy
+# Same URI as get_client() and the seed, so seeding and every scorer hit one cluster
+MONGO_URI = get_mongo_uri()
+DEBUG = os.getenv("EXPORT_GOLD_DEBUG") == "1"
 
 if not MONGO_URI:
     print("ERROR: MongoDb-Connection-String or MONGO_URI env var not set")
@@ -41,16 +47,12 @@ except ImportError as e:
     sys.exit(1)
 
 # --- DB Isolation ---
-class V2RedirectClient(MongoClient):
-    """Wraps MongoClient to redirect ALL database access to PLI_Leaderboard_v2."""
-    def get_database(self, name=None, codec_options=None, read_preference=None, write_concern=None, read_concern=None):
-        target = TEST_DB_NAME
-        if name in ["internal", "iwell", "PLI_Leaderboard", "core", "leaderboard"]:
-             target = TEST_DB_NAME
-        return super().get_database(target, codec_options, read_preference, write_concern, read_concern)
-
-    def __getitem__(self, name):
-        return self.get_database(name)
+@contextmanager
+def redirect_all_databases(target_db):
+    """Route every MongoClient's db lookups (client[name], get_database) to target_db."""
+    with patch.object(MongoClient, "__getitem__", lambda self, _name: target_db), \
+         patch.object(MongoClient, "get_database", lambda self, name=None, *args, **kwargs: target_db):
+        yield
 
 # --- Configuration Helpers ---
 def apply_lumpsum_override(db):
@@ -77,6 +79,18 @@ def apply_sip_override(db):
     )
 
 # --- Export Helper ---
+# Matches json.dump(indent=2, sort_keys=True, default=str) apart from orjson's
+# UTF-8 (not \u-escaped) strings and shortest float spelling
+SNAPSHOT_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Non-deterministic fields are excluded server-side so they never cross the wire
+EXCLUDE_PROJECTION = {
+    "_id": 0, "updatedAt": 0, "createdAt": 0, "updated_at": 0, "created_at": 0, "config_hash": 0, "AuditMeta": 0
+}
+
+# col_name -> "month" | "period_month"; the schema doesn't change between scenarios
+_MONTH_FIELD_CACHE = {}
+
 def export_snapshots(db, output_dir, target_month="2025-11"):
     print(f"Exporting snapshots to {output_dir}...")
     os.makedirs(output_dir, exist_ok=True)
@@ -84,39 +98,37 @@ def export_snapshots(db, output_dir, target_month="2025-11"):
     collections = ["Leaderboard_Lumpsum", "MF_SIP_Leaderboard", "Public_Leaderboard"]
 
     for col_name in collections:
-        # Query
-        if db[col_name].count_documents({"month": target_month}) > 0:
-            query = {"month": target_month}
-        elif db[col_name].count_documents({"period_month": target_month}) > 0:
-            query = {"period_month": target_month}
-        else:
-            # Fallback or empty
-            query = {"month": target_month}
-
-        docs = list(db[col_name].find(query))
-
-        # Sort deterministically
-        docs.sort(key=lambda x: (x.get("employee_id") or x.get("_id") or "", x.get("period_month") or x.get("month") or ""))
-
-        # Normalize
-        normalized = []
-        for d in docs:
-            # Remove non-deterministic fields
-            for key in ["_id", "updatedAt", "createdAt", "updated_at", "created_at", "config_hash", "AuditMeta"]:
-                d.pop(key, None)
-
-            # Recursively walk to remove nested dates if needed, or just specific top levels
-            if "audit" in d and isinstance(d["audit"], dict):
-                # public leaderboard audit doesn't usually have timestamps, but check
-                pass
-
-            normalized.append(d)
-
+        # Query (month field detected once per collection, then reused across scenarios)
+        field = _MONTH_FIELD_CACHE.get(col_name)
+        if field is None:
+            if db[col_name].find_one({"month": target_month}, {"_id": 1}):
+                field = _MONTH_FIELD_CACHE[col_name] = "month"
+            elif db[col_name].find_one({"period_month": target_month}, {"_id": 1}):
+                field = _MONTH_FIELD_CACHE[col_name] = "period_month"
+            else:
+                # Fallback or empty (not cached; a later scenario may have data)
+                field = "month"
+        query = {field: target_month}
+
+        # The server streams docs pre-sorted
+        # (_id breaks ties in insertion order, as the old stable in-memory sort did)
+        cursor = db[col_name].find(
+            query, projection=EXCLUDE_PROJECTION, batch_size=1000
+        ).sort([("employee_id", 1), (field, 1), ("_id", 1)])
+
+        # Stream each doc as an indented array element, as a 2-space list dump would lay it out
         out_path = os.path.join(output_dir, f"{col_name}.json")
-        with open(out_path, "w") as f:
-            json.dump(normalized, f, indent=2, default=str, sort_keys=True)
-
-        print(f"  Saved {col_name}.json ({len(normalized)} records)")
+        count = 0
+        with open(out_path, "w", encoding="utf-8") as f:
+            for d in cursor:
+                f.write(",\n" if count else "[\n")
+                f.write(textwrap.indent(orjson.dumps(d, option=SNAPSHOT_JSON_OPTS, default=str).decode(), "  "))
+                count += 1
+            f.write("\n]" if count else "[]")
+        # CI compares this digest against the engine export before diffing trees
+        write_snapshot_digest(out_path)
+
+        print(f"  Saved {col_name}.json ({count} records)")
 
 # --- Main Pipeline ---
 def run_pipeline(scenario, output_dir):
@@ -129,15 +141,17 @@ def run_pipeline(scenario, output_dir):
     # reset_seed_v2.py uses DB_NAME="PLI_Leaderboard_v2" hardcoded.
     # But let's run it.
     print("  > Seeding Database...")
-    reset_seed_v2.seed_data()
+    reset_seed_v2.seed_data(skip_if_current=True)
 
     # Reset Lumpsum Scorer internal state to prevent streak accumulation between scenarios
     if hasattr(Lumpsum_Scorer, "_POSITIVE_STREAKS"):
         Lumpsum_Scorer._POSITIVE_STREAKS.clear()
 
-    # 2. Patch & Connect
-    client = MongoClient(MONGO_URI)
+    # 2. Patch & Connect (reuses one pooled client across scenarios)
+    client = get_client()
     db = client[TEST_DB_NAME]
+    # Overrides and scorers below mutate the seeded DB, so the next scenario must reseed
+    reset_seed_v2.mark_seed_dirty(db)
 
     # 3. Apply Overrides
     if scenario == "override_lumpsum":
@@ -154,48 +168,84 @@ def run_pipeline(scenario, output_dir):
 
     # Patch SIP Scorer specific collection accessor
     def patched_tx_coll(client):
-        print(f"DEBUG: patched_tx_coll called! Client: {client}")
+        if DEBUG:
+            print(f"DEBUG: patched_tx_coll called! Client: {client}")
         return client[TEST_DB_NAME]["transactions"]
     SIP_Scorer._tx_coll = patched_tx_coll
 
-    with patch('pymongo.MongoClient', side_effect=V2RedirectClient):
-        # Lumpsum
-        try:
-            Lumpsum_Scorer.run_net_purchase(leaderboard_db=db, target_month=target_month, mongo_client=client)
-        except Exception as e:
-            print(f"!! Lumpsum Error: {e}")
-            traceback.print_exc()
-
-        # SIP
-        try:
-            print(f"  > DEBUG: Inspecting transactions in {TEST_DB_NAME} before SIP run...")
-            count = db.transactions.count_documents({})
-            print(f"  > DEBUG: db.transactions count: {count}")
-            sample = db.transactions.find_one({})
-            print(f"  > DEBUG: Sample txn: {sample}")
-
-            SIP_Scorer.run_pipeline(start_date=start_dt, end_date=end_dt, mongo_uri=MONGO_URI)
-        except Exception as e:
-            print(f"!! SIP Error: {e}")
-            traceback.print_exc()
-
-        # Leaderboard
-        try:
-            Leaderboard.run(month=target_month, mongo_uri=MONGO_URI, db_name=TEST_DB_NAME, process_full_fy=False)
-        except Exception as e:
-            print(f"!! Leaderboard Error: {e}")
-            traceback.print_exc()
+    # Lumpsum never touches `transactions`, so inspecting it ahead of the scorers sees what SIP will
+    if DEBUG:
+        print(f"  > DEBUG: Inspecting transactions in {TEST_DB_NAME} before SIP run...")
+        count = db.transactions.estimated_document_count()
+        print(f"  > DEBUG: db.transactions count: {count}")
+        sample = db.transactions.find_one({})
+        print(f"  > DEBUG: Sample txn: {sample}")
+
+    # Order matters: Leaderboard aggregates the Lumpsum and SIP outputs
+    scorer_tasks = [
+        ("Lumpsum", Lumpsum_Scorer.run_net_purchase,
+         {"leaderboard_db": db, "target_month": target_month, "mongo_client": client}),
+        ("SIP", SIP_Scorer.run_pipeline,
+         {"start_date": start_dt, "end_date": end_dt, "mongo_uri": MONGO_URI}),
+        ("Leaderboard", Leaderboard.run,
+         {"month": target_month, "mongo_uri": MONGO_URI, "db_name": TEST_DB_NAME, "process_full_fy": False}),
+    ]
+
+    with redirect_all_databases(db):
+        for name, fn, kwargs in scorer_tasks:
+            try:
+                fn(**kwargs)
+            except Exception as e:
+                print(f"!! {name} Error: {e}")
+                traceback.print_exc()
 
     # 5. Export
     export_snapshots(db, output_dir, target_month)
     print(f"Completed: {scenario}")
 
 import argparse
+import compileall
+import subprocess
+
+# Packages every scenario subprocess imports on startup
+SCENARIO_IMPORT_DIRS = ["Lumpsum_Scorer", "SIP_Scorer", "Leaderboard", "tools"]
+
+def run_scenarios_parallel(scenarios_to_run, base_out, jobs):
+    """
+    Run each scenario in its own export_gold subprocess against its own
+    PLI_Leaderboard_v2_<scenario> database (scenarios reseed and mutate the DB,
+    so they cannot share one). The per-scenario DBs are dropped afterwards.
+    """
+    # Byte-compile the scorer imports once up front; otherwise concurrent children would
+    # each compile the (large) scorer modules cold and race to write the same .pyc files
+    for d in SCENARIO_IMPORT_DIRS:
+        compileall.compile_dir(os.path.join(ROOT_DIR, d), maxlevels=0, quiet=1)
+
+    pending = list(scenarios_to_run)
+    running = []
+    failed = []
+    while pending or running:
+        while pending and len(running) < jobs:
+            sc_name, _ = pending.pop(0)
+            env = os.environ.copy()
+            env["PARITY_DB_NAME"] = f"{TEST_DB_NAME}_{sc_name}"
+            cmd = [sys.executable, os.path.abspath(__file__), "--scenario", sc_name, "--output-dir", base_out]
+            print(f"  > Subprocess: {sc_name} (db {env['PARITY_DB_NAME']})")
+            running.append((sc_name, env["PARITY_DB_NAME"], subprocess.Popen(cmd, env=env)))
+        sc_name, db_name, proc = running.pop(0)
+        if proc.wait() != 0:
+            failed.append(sc_name)
+        get_client().drop_database(db_name)
+
+    if failed:
+        print(f"ERROR: Scenarios failed: {failed}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run scoring pipeline and export snapshots.")
     parser.add_argument("--scenario", type=str, choices=["default", "override_lumpsum", "override_sip", "all"], default="all", help="Scenario to run")
     parser.add_argument("--output-dir", type=str, default=None, help="Base directory for output (default: gold/2025-11)")
+    parser.add_argument("--jobs", type=int, default=1, help="Run up to N scenarios concurrently, each in its own DB (default: 1, sequential)")
 
     args = parser.parse_args()
 
@@ -220,7 +270,10 @@ if __name__ == "__main__":
 
     os.environ["CONFIRM_DROP"] = "yes" # Force seed
 
-    for sc_name, sc_dir in scenarios_to_run:
-        run_pipeline(sc_name, sc_dir)
+    if args.jobs > 1 and len(scenarios_to_run) > 1:
+        run_scenarios_parallel(scenarios_to_run, base_out, args.jobs)
+    else:
+        for sc_name, sc_dir in scenarios_to_run:
+            run_pipeline(sc_name, sc_dir)
 
     print(f"\nSnapshots Verified/Exported for: {[s[0] for s in scenarios_to_run]}")
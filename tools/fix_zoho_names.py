@@ -1,21 +1,20 @@
-from pymongo import MongoClient
-import os
+from _mongo import get_client
+from reset_seed_v2 import mark_seed_dirty
+from pymongo import UpdateMany
 
-CONN = os.getenv("MONGODB_CONNECTION_STRING")
-c = MongoClient(CONN)
+c = get_client()
 db_v2 = c['PLI_Leaderboard_v2']
+mark_seed_dirty(db_v2)  # the seeded DB no longer matches the fixture
 
 print("Updating Zoho_Users in v2...")
-# Using pipeline update to copy field
-res = db_v2.Zoho_Users.update_many(
-    {"Full Name": {"$exists": False}},
-    [{"$set": {"Full Name": "$full_name"}}]
-)
-print(f"Modified {res.modified_count} docs")
-
-# Verify
-sample = db_v2.Zoho_Users.find_one({"Full Name": {"$exists": True}})
-if sample:
-    print(f"Sample verification: id={sample.get('id')}, Full Name='{sample.get('Full Name')}'")
-else:
-    print("Warning: No docs have 'Full Name' after update?")
+# Pipeline updates copy fields server-side; further name/alias fixups go in the same batch
+ops = [
+    UpdateMany(
+        {"Full Name": {"$exists": False}},
+        [{"$set": {"Full Name": "$full_name"}}]
+    ),
+]
+res = db_v2.Zoho_Users.bulk_write(ops, ordered=False)
+print(f"Matched {res.matched_count} docs, modified {res.modified_count} docs")
+if res.matched_count and not res.modified_count:
+    print("Warning: docs matched but none were modified (missing 'full_name'?)")
@@ -1,10 +1,12 @@
-
-import pymongo
+from _mongo import get_client
 import datetime
 
 def generate_audit_report():
-    client = pymongo.MongoClient(os.getenv("MONGODB_CONNECTION_STRING"))
+    client = get_client()
     db = client["PLI_Leaderboard_v2"]
+    # BSON dates hold milliseconds; truncate so the stored timestamp equals run_start exactly
+    run_start = datetime.datetime.now()
+    run_start = run_start.replace(microsecond=run_start.microsecond // 1000 * 1000)
 
     # 1. Identify Inactive RMs
     inactive_query = {
@@ -16,56 +18,75 @@ def generate_audit_report():
             {"IsActive": False}
         ]
     }
-    inactive_users = list(db.Zoho_Users.find(inactive_query))
-
-    audit_logs = []
-    report_rows = []
-
-    print(f"Found {len(inactive_users)} inactive/suspended users in Zoho_Users.")
+    print(f"Found {db.Zoho_Users.count_documents(inactive_query)} inactive/suspended users in Zoho_Users.")
 
-    for user in inactive_users:
-        name = user.get("Full Name") or user.get("Name") or "Unknown"
-        emp_id = user.get("id") or user.get("employee_id")
-        status = user.get("status") or user.get("Status") or ("Inactive" if not user.get("active") else "Unknown")
-        inactive_since = user.get("inactive_since")
+    # 2. Build and persist the audit entries server-side in one pass:
+    #    Deactivation log when inactive_since is set, plus a Visibility Restoration log when the
+    #    RM still has Public_Leaderboard rows (e.g. May for Kawal). Entries are keyed
+    #    "<employee_id>|<action>" so reruns replace them in place; users without an employee id
+    #    fall back to their Zoho _id so they don't collide on "None|<action>".
+    def log_entry(action, effective_date, reason, status, **extra):
+        return {
+            "_id": {"$concat": ["$audit_key", f"|{action}"]},
+            "employee_id": "$employee_id",
+            "employee_name": "$employee_name",
+            "action": action,
+            "effective_date": effective_date,
+            "reason": reason,
+            "status": status,
+            "timestamp": {"$literal": run_start},
+            **extra,
+        }
 
-        # Create Deactivation Log
-        if inactive_since:
-            log_entry = {
-                "employee_id": str(emp_id),
-                "employee_name": name,
-                "action": "System_Deactivation",
-                "effective_date": inactive_since,
-                "reason": "Lifecycle Management (Inferred)",
-                "status": "inactive",
-                "timestamp": datetime.datetime.now()
-            }
-            audit_logs.append(log_entry)
-            report_rows.append([name, "Deactivation", inactive_since, "Inactive"])
+    db.Zoho_Users.aggregate([
+        {"$match": inactive_query},
+        {"$project": {
+            "_id": 0,
+            "employee_name": {"$ifNull": ["$Full Name", "$Name", "Unknown"]},
+            "employee_id": {"$ifNull": [{"$toString": {"$ifNull": ["$id", "$employee_id"]}}, "None"]},
+            "audit_key": {"$ifNull": [{"$toString": {"$ifNull": ["$id", "$employee_id"]}}, {"$toString": "$_id"}]},
+            "inactive_since": 1,
+        }},
+        {"$lookup": {
+            "from": "Public_Leaderboard",
+            "localField": "employee_name",
+            "foreignField": "rm_name",
+            "pipeline": [{"$count": "n"}],
+            "as": "pb",
+        }},
+        {"$set": {"pb_count": {"$ifNull": [{"$first": "$pb.n"}, 0]}}},
+        {"$project": {"entries": {"$concatArrays": [
+            {"$cond": [
+                {"$ifNull": ["$inactive_since", False]},
+                [log_entry("System_Deactivation", "$inactive_since", "Lifecycle Management (Inferred)", "inactive")],
+                [],
+            ]},
+            {"$cond": [
+                {"$gt": ["$pb_count", 0]},
+                [log_entry("Data_Visibility_Restored", {"$literal": run_start}, "Historical Rebuild Fix",
+                           "visible_historic", visible_rows="$pb_count")],
+                [],
+            ]},
+        ]}}},
+        {"$unwind": "$entries"},
+        {"$replaceRoot": {"newRoot": "$entries"}},
+        {"$merge": {"into": "RM_Audit_Logs", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ], allowDiskUse=True)
 
-        # Check Visibility in Public_Leaderboard (Visibility Restoration)
-        # We check a recent month where they might be inactive but visible (e.g. May for Kawal)
-        pb_count = db.Public_Leaderboard.count_documents({"rm_name": name})
-
-        if pb_count > 0:
-            log_entry = {
-                "employee_id": str(emp_id),
-                "employee_name": name,
-                "action": "Data_Visibility_Restored",
-                "effective_date": datetime.datetime.now(),
-                "reason": "Historical Rebuild Fix",
-                "status": "visible_historic",
-                "timestamp": datetime.datetime.now()
-            }
-            audit_logs.append(log_entry)
-            report_rows.append([name, "Visibility Restored", "FY25-26", f"Visible ({pb_count} months)"])
-
-    # 2. Persist to RM_Audit_Logs
+    audit_logs = list(
+        db.RM_Audit_Logs.find({"timestamp": run_start}).sort([("employee_name", 1), ("action", -1)])
+    )
     if audit_logs:
-        db.RM_Audit_Logs.drop() # Reset for this "First Report" generation
-        db.RM_Audit_Logs.insert_many(audit_logs)
+        # Clear entries from earlier runs (keeps the collection and its indexes, unlike drop())
+        db.RM_Audit_Logs.delete_many({"timestamp": {"$lt": run_start}})
         print(f"Persisted {len(audit_logs)} entries to RM_Audit_Logs.")
 
+    report_rows = []
+    for e in audit_logs:
+        if e["action"] == "System_Deactivation":
+            report_rows.append([e["employee_name"], "Deactivation", e["effective_date"], "Inactive"])
+        else:
+            report_rows.append([e["employee_name"], "Visibility Restored", "FY25-26", f"Visible ({e['visible_rows']} months)"])
 
     # 3. Print Report
     print("\n=== RM Audit Log Report (Generated) ===\n")
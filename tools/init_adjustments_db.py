@@ -2,37 +2,36 @@
 import os
 import sys
 import pymongo
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from _mongo import ensure_indexes, get_client, get_mongo_uri
 
 def init_db():
-    mongo_uri = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGODB_URI")
+    mongo_uri = get_mongo_uri()
     db_name = os.getenv("PLI_DB_NAME", "PLI_Leaderboard")
 
     if not mongo_uri:
         print("Error: Mongo URI missing")
         sys.exit(1)
 
-    client = MongoClient(mongo_uri)
+    client = get_client()
     db = client[db_name]
     coll_name = "Leaderboard_Adjustments"
 
-    if coll_name not in db.list_collection_names():
-        print(f"Creating collection {coll_name}...")
-        db.create_collection(coll_name)
-
+    # create_index implicitly creates the collection if it is missing
     coll = db[coll_name]
 
-    # Indexes
-    # 1. Lookup by Employee/Month/Status (for API fetches)
-    print("Creating index: employee_id_1_month_1_status_1")
-    coll.create_index(
-        [("employee_id", ASCENDING), ("month", ASCENDING), ("status", ASCENDING)],
-        background=True
-    )
-
-    # 2. Lookup by creation time (audit/history)
-    print("Creating index: created_at_-1")
-    coll.create_index([("created_at", DESCENDING)], background=True)
+    # Indexes (only the missing ones are created)
+    created = ensure_indexes(coll, [
+        # 1. Lookup by Employee/Month/Status (for API fetches)
+        IndexModel(
+            [("employee_id", ASCENDING), ("month", ASCENDING), ("status", ASCENDING)],
+            background=True
+        ),
+        # 2. Lookup by creation time (audit/history)
+        IndexModel([("created_at", DESCENDING)], background=True),
+    ])
+    for ix in created:
+        print(f"Created index: {ix.document['name']}")
 
     print("Done.")
 
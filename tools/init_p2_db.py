@@ -2,56 +2,63 @@
 import os
 import sys
 import pymongo
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from _mongo import ensure_indexes, get_client, get_mongo_uri
 
 def init_db():
-    mongo_uri = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGODB_URI")
+    mongo_uri = get_mongo_uri()
     db_name = os.getenv("PLI_DB_NAME", "PLI_Leaderboard")
 
     if not mongo_uri:
         print("Error: Mongo URI missing")
         sys.exit(1)
 
-    client = MongoClient(mongo_uri)
+    client = get_client()
     db = client[db_name]
 
-    # 1. Leaderboard_Disputes
-    if "Leaderboard_Disputes" not in db.list_collection_names():
-        print("Creating Leaderboard_Disputes...")
-        db.create_collection("Leaderboard_Disputes")
+    # create_indexes implicitly creates a missing collection, so no listCollections
+    # pre-check is needed; ensure_indexes only sends the indexes that are missing.
 
-    db.Leaderboard_Disputes.create_index(
-        [("employee_id", ASCENDING), ("month", ASCENDING), ("status", ASCENDING)],
-        background=True
-    )
-    db.Leaderboard_Disputes.create_index([("created_at", DESCENDING)], background=True)
+    # 1. Leaderboard_Disputes
+    print("Ensuring Leaderboard_Disputes indexes...")
+    ensure_indexes(db.Leaderboard_Disputes, [
+        IndexModel(
+            [("employee_id", ASCENDING), ("month", ASCENDING), ("status", ASCENDING)],
+            background=True
+        ),
+        IndexModel([("created_at", DESCENDING)], background=True),
+    ])
 
     # 2. Forecast_Events
-    if "Forecast_Events" not in db.list_collection_names():
-        print("Creating Forecast_Events...")
-        db.create_collection("Forecast_Events")
-
-    db.Forecast_Events.create_index(
-        [("employee_id", ASCENDING), ("month", ASCENDING), ("product", ASCENDING)],
-        background=True
-    )
-    db.Forecast_Events.create_index([("expected_close_date", ASCENDING)], background=True)
+    print("Ensuring Forecast_Events indexes...")
+    ensure_indexes(db.Forecast_Events, [
+        IndexModel(
+            [("employee_id", ASCENDING), ("month", ASCENDING), ("product", ASCENDING)],
+            background=True
+        ),
+        IndexModel([("expected_close_date", ASCENDING)], background=True),
+    ])
 
     # 3. Forecast_Leaderboard
-    if "Forecast_Leaderboard" not in db.list_collection_names():
-        print("Creating Forecast_Leaderboard...")
-        db.create_collection("Forecast_Leaderboard")
-
-    # Unique constraint for upsert
-    db.Forecast_Leaderboard.create_index(
-        [("employee_id", ASCENDING), ("month", ASCENDING), ("channel", ASCENDING)],
-        unique=True,
-        background=True
-    )
-    db.Forecast_Leaderboard.create_index(
-        [("month", ASCENDING), ("channel", ASCENDING)],
-        background=True
-    )
+    print("Ensuring Forecast_Leaderboard indexes...")
+    ensure_indexes(db.Forecast_Leaderboard, [
+        # Unique constraint for upsert
+        IndexModel(
+            [("employee_id", ASCENDING), ("month", ASCENDING), ("channel", ASCENDING)],
+            unique=True,
+            background=True
+        ),
+        IndexModel(
+            [("month", ASCENDING), ("channel", ASCENDING)],
+            background=True
+        ),
+    ])
+
+    # 4. Admin_Permissions (RBAC role lookup by email; utils/rbac.py hints this index by name)
+    print("Ensuring Admin_Permissions indexes...")
+    ensure_indexes(db.Admin_Permissions, [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_1", background=True),
+    ])
 
     print("Phase 2 DB foundation applied.")
 
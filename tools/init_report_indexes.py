@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+import os
+import sys
+from pymongo import ASCENDING, IndexModel
+from _mongo import ensure_indexes, get_client, get_mongo_uri
+
+def init_db():
+    mongo_uri = get_mongo_uri()
+    db_name = os.getenv("PLI_DB_NAME", "PLI_Leaderboard_v2")
+
+    if not mongo_uri:
+        print("Error: Mongo URI missing")
+        sys.exit(1)
+
+    client = get_client()
+    db = client[db_name]
+
+    # Indexes behind the read-only report/inspector scripts, which no longer create them
+    # on every run; ensure_indexes only sends the indexes that are missing.
+
+    # 1. Insurance_Policy_Scoring
+    print("Ensuring Insurance_Policy_Scoring indexes...")
+    ensure_indexes(db.Insurance_Policy_Scoring, [
+        # explain_rohit_points.py: name + renewal-date range $match
+        IndexModel([("employee_name", ASCENDING), ("renewal_date", ASCENDING)], background=True),
+        # calc_insurance_bonus.py: renewal-date range scan, employee_id rides along for the group
+        IndexModel([("renewal_date", ASCENDING), ("employee_id", ASCENDING)], background=True),
+    ])
+
+    print(f"Report indexes applied to {db_name}.")
+
+if __name__ == "__main__":
+    init_db()
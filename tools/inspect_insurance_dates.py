@@ -1,9 +1,7 @@
-from pymongo import MongoClient
-import os
+from _mongo import get_read_client
 from datetime import datetime
 
-CONN = os.getenv("MONGODB_CONNECTION_STRING")
-c = MongoClient(CONN)
+c = get_read_client()
 db_v2 = c['PLI_Leaderboard_v2']
 
 print("Checking Insurance_Policy_Scoring date range in v2...")
@@ -25,7 +23,8 @@ pipeline = [
 ]
 
 print("Sample Dec 2025 Records:")
-res = list(db_v2.Insurance_Policy_Scoring.aggregate(pipeline))
+# Only 5 docs are wanted; the renewal_date match rides the (renewal_date, employee_id) index
+res = list(db_v2.Insurance_Policy_Scoring.aggregate(pipeline, batchSize=5))
 for r in res:
     print(f"Emp: {r.get('employee_name')} ({r.get('employee_id')}) - Date: {r.get('renewal_date')}")
 
@@ -1,8 +1,7 @@
 
-import pymongo
-import os
+from _mongo import get_read_client
 
-client = pymongo.MongoClient(os.getenv("MONGODB_CONNECTION_STRING"))
+client = get_read_client()
 db = client["PLI_Leaderboard_v2"]
 
 print("Connected to PLI_Leaderboard_v2")
@@ -3,9 +3,10 @@ import json
 import os
 import sys
 import fnmatch
+import orjson
 from typing import Any
 import pymongo
-from pymongo import MongoClient
+from _mongo import get_client
 
 # Load Config
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "regression_config.json")
@@ -16,6 +17,9 @@ with open(CONFIG_PATH) as f:
 
 DIFF_CFG = CONFIG["diff"]
 OUTPUTS = CONFIG["collections"]["outputs"]
+FLOAT_ROUND = DIFF_CFG["float_round_for_compare_decimals"]
+FLOAT_TOL = DIFF_CFG["float_abs_tolerance"]
+IGNORE_GLOBS = DIFF_CFG["ignore_fields_glob"]
 
 def get_replay_docs(client, db_name, coll_name, months):
     db = client[db_name]
@@ -27,29 +31,27 @@ def load_baseline_docs(baseline_dir, coll_name):
     path = os.path.join(baseline_dir, f"{coll_name}.jsonl")
     if not os.path.exists(path):
         return []
-    docs = []
-    with open(path) as f:
-        for line in f:
-            docs.append(json.loads(line))
-    return docs
+    # orjson parses the raw bytes of each line directly; no str decode step
+    with open(path, "rb") as f:
+        return [orjson.loads(line) for line in f]
 
 def normalize_val(val, key_path=""):
     # Float rounding
     if isinstance(val, float):
-        return round(val, DIFF_CFG["float_round_for_compare_decimals"])
+        return round(val, FLOAT_ROUND)
     return val
 
+def compared_fields(strict_fields):
+    # Resolve ignore globs once per collection instead of per (doc, field)
+    ignored = {f for f in strict_fields for glob in IGNORE_GLOBS if fnmatch.fnmatch(f, glob)}
+    return [f for f in strict_fields if f not in ignored]
+
 def compare_docs(b, r, strict_fields):
+    # strict_fields must already be filtered through compared_fields()
     diffs = {}
 
     # Check strict fields
     for f in strict_fields:
-        # Resolve ignored
-        ignored = False
-        for glob in DIFF_CFG["ignore_fields_glob"]:
-            if fnmatch.fnmatch(f, glob): ignored = True; break
-        if ignored: continue
-
         bv = b.get(f)
         rv = r.get(f)
 
@@ -60,44 +62,51 @@ def compare_docs(b, r, strict_fields):
         # Tolerance check for floats
         is_float = isinstance(nb, (float, int)) and isinstance(nr, (float, int))
         if is_float:
-            if abs(nb - nr) > DIFF_CFG["float_abs_tolerance"]:
+            if abs(nb - nr) > FLOAT_TOL:
                 diffs[f] = {"base": bv, "replay": rv}
         else:
             if nb != nr:
                 diffs[f] = {"base": bv, "replay": rv}
     return diffs
 
-def get_pk(doc, pk_fields):
-    vals = []
-    for f in pk_fields:
-        v = doc.get(f)
-        if v is None: # Aliases?
-            if f == "period_month": v = doc.get("month")
-            elif f == "month": v = doc.get("period_month")
-            elif f == "employee_id": v = doc.get("rm_name")
-        vals.append(str(v))
-    return "|".join(vals)
+# Fallback field when a PK field is missing/None
+PK_ALIASES = {"period_month": "month", "month": "period_month", "employee_id": "rm_name"}
+
+def make_pk_getter(pk_fields):
+    # Resolve aliases once per collection; the returned closure only does dict gets
+    pairs = tuple((f, PK_ALIASES.get(f)) for f in pk_fields)
+
+    def get_pk(doc):
+        get = doc.get
+        vals = []
+        for f, alias in pairs:
+            v = get(f)
+            if v is None and alias:
+                v = get(alias)
+            vals.append(str(v))
+        return "|".join(vals)
+
+    return get_pk
 
 def main():
-    mongo_uri = os.getenv("MONGODB_CONNECTION_STRING")
     replay_db = os.environ.get(CONFIG["replay"]["replay_db_name_env"], "PLI_Leaderboard_TEST")
     baseline_dir = CONFIG["snapshot"]["baseline_dir"]
 
-    client = MongoClient(mongo_uri)
+    client = get_client()
 
     report = {"collections": {}, "summary": {"status": "PASS"}}
     fail = False
 
     for coll_def in OUTPUTS:
         name = coll_def["name"]
-        pk = coll_def["primary_key"]
-        strict = coll_def["strict_fields"]
+        get_pk = make_pk_getter(coll_def["primary_key"])
+        strict = compared_fields(coll_def["strict_fields"])
 
         base_docs = load_baseline_docs(baseline_dir, name)
         rep_docs = get_replay_docs(client, replay_db, name, []) # Get all from replay DB
 
-        pmap_base = {get_pk(d, pk): d for d in base_docs}
-        pmap_rep = {get_pk(d, pk): d for d in rep_docs}
+        pmap_base = {get_pk(d): d for d in base_docs}
+        pmap_rep = {get_pk(d): d for d in rep_docs}
 
         missing = []
         extra = []
@@ -2,12 +2,18 @@
 import os
 import sys
 import json
+import orjson
 import logging
 import datetime
 from datetime import timezone
+import time
+import re
 import pymongo
-from pymongo import MongoClient
+from _mongo import get_client
+from pymongo.write_concern import WriteConcern
+from bson import json_util
 import importlib
+from unittest.mock import patch
 
 # Config loading
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "regression_config.json")
@@ -23,6 +29,43 @@ CORE_DB_NAME_REPLAY = CONFIG["replay"]["core_db_name_replay"]
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Replay")
 
+# Fixture docs are flushed to Mongo in batches of this size while the JSONL file is read
+FIXTURE_BATCH_SIZE = 2000
+
+# Fixture inserts go out unacknowledged (no per-batch ack round-trip). Safe because the
+# replay DBs are disposable; load_fixtures then waits for the acknowledged counts to
+# reach what was sent, so a silently failed load still stops the replay.
+FIXTURE_WRITE_CONCERN = WriteConcern(w=0)
+FIXTURE_COUNT_TIMEOUT_S = 60
+
+# Snapshots written before the Extended JSON switch stored datetimes as bare isoformat()
+# strings. Only values that look like an ISO timestamp are handed to fromisoformat, so
+# the names/emails that make up most string fields never raise.
+_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}T")
+
+def _fix_legacy_dates(d):
+    for k, v in d.items():
+        if isinstance(v, str) and _ISO.match(v):
+            try:
+                d[k] = datetime.datetime.fromisoformat(v)
+            except ValueError:
+                pass
+    return d
+
+def wait_for_fixture_counts(expected, timeout_s=FIXTURE_COUNT_TIMEOUT_S):
+    """expected: [(collection, count)]. Exits if any collection is still short at the deadline."""
+    deadline = time.monotonic() + timeout_s
+    pending = list(expected)
+    while pending:
+        pending = [(coll, n) for coll, n in pending if coll.count_documents({}) < n]
+        if not pending:
+            return
+        if time.monotonic() > deadline:
+            for coll, n in pending:
+                logger.error(f"Fixture load incomplete: {coll.database.name}.{coll.name} has {coll.count_documents({})}/{n} docs")
+            sys.exit(1)
+        time.sleep(0.5)
+
 def load_fixtures(client, replay_lb_db, replay_core_db, baseline_dir):
     logger.info("Loading fixtures into Replay DBs...")
 
@@ -42,7 +85,10 @@ def load_fixtures(client, replay_lb_db, replay_core_db, baseline_dir):
 
     with open(meta_path) as f:
         meta = json.load(f)
+    # metadata.json without fixture_format predates Extended JSON fixtures
+    legacy_dates = meta.get("fixture_format") != "extjson"
 
+    expected_counts = []
     for col_name, count in meta["counts"].items():
         if count == 0: continue
 
@@ -62,32 +108,53 @@ def load_fixtures(client, replay_lb_db, replay_core_db, baseline_dir):
         if not os.path.exists(file_path):
             continue
 
-        docs = []
-        with open(file_path) as f:
+        target_coll = target_db.get_collection(col_name, write_concern=FIXTURE_WRITE_CONCERN)
+        already = target_db[col_name].count_documents({})
+        # Tags the load's inserts in the server log/profiler/currentOp
+        load_comment = f"replay-load:{col_name}"
+        batch = []
+        loaded = 0
+        # Fixtures are Extended JSON (see leaderboard_snapshot). Lines without any "$"-key
+        # (no dates/ObjectIds) are plain JSON and go straight to orjson; the rest are decoded
+        # by bson.json_util, which restores $date/$oid/... at any depth.
+        with open(file_path, "rb") as f:
             for line in f:
-                d = json.loads(line)
-                # Fix dates
-                for k, v in d.items():
-                    if isinstance(v, str):
-                        try:
-                            # Strict formats?
-                            if "T" in v and len(v) > 10:
-                                d[k] = datetime.datetime.fromisoformat(v)
-                        except: pass
-                    if k == "_id" and isinstance(v, dict) and "$oid" in v:
-                        from bson import ObjectId
-                        d[k] = ObjectId(v["$oid"])
-                docs.append(d)
-
-        if docs:
-            # Deterministic Sort before Insert
-            # Try sorting by _id if exists, else generic string dump
-            try:
-                docs.sort(key=lambda x: str(x.get("_id")))
-            except: pass
-
-            target_db[col_name].insert_many(docs)
-            logger.info(f"Loaded {col_name} ({len(docs)}) into {target_db.name}")
+                if b'"$' in line:
+                    d = json_util.loads(line)
+                else:
+                    d = orjson.loads(line)
+                if legacy_dates:
+                    _fix_legacy_dates(d)
+                batch.append(d)
+                if len(batch) >= FIXTURE_BATCH_SIZE:
+                    target_coll.insert_many(batch, ordered=False, comment=load_comment)
+                    loaded += len(batch)
+                    batch = []
+
+        if batch:
+            target_coll.insert_many(batch, ordered=False, comment=load_comment)
+            loaded += len(batch)
+
+        if loaded:
+            expected_counts.append((target_db[col_name], already + loaded))
+            logger.info(f"Loaded {col_name} ({loaded}) into {target_db.name}")
+
+    # Unacknowledged inserts: confirm they all landed before scorers read them
+    wait_for_fixture_counts(expected_counts)
+
+class RedirectClient(pymongo.MongoClient):
+    """MongoClient whose database lookups are remapped through the class-level db_map."""
+    db_map = {}
+
+    def __getitem__(self, name):
+        return super().__getitem__(self.db_map.get(name, name))
+
+    def get_database(self, name=None, *args, **kwargs):
+        return super().get_database(self.db_map.get(name, name), *args, **kwargs)
+
+def make_redirect_client(db_map):
+    """RedirectClient subclass bound to db_map (e.g. {"PLI_Leaderboard": "PLI_Leaderboard_TEST"})."""
+    return type("RedirectClient", (RedirectClient,), {"db_map": dict(db_map)})
 
 def run_scorers(months, replay_lb_db, replay_core_db):
     logger.info("Invoking Scorers...")
@@ -112,11 +179,14 @@ def run_scorers(months, replay_lb_db, replay_core_db):
     # 1. SIP
     logger.info("[SIP] Starting...")
     try:
-        import SIP_Scorer
+        # Scorer imports stay here, after the env injection above: the modules read their
+        # DB names from env at import time. Entry points are bound once, outside the months loop.
         # Check if SIP supports DB override in run_pipeline
         # Signature: run_pipeline(start, end, mongo_uri=None, db_name=None, ...)
         # We can pass db_name!
         from SIP_Scorer import run_pipeline, _default_month_window
+        # Months run in order, not in parallel: SIP's streak lookup reads the previous
+        # month's MF_SIP_Leaderboard rows (consecutive_positive_months) written by the prior iteration.
         for m in months:
             s, e = _default_month_window(m)
             run_pipeline(s, e, db_name=replay_lb_db)
@@ -142,25 +212,17 @@ def run_scorers(months, replay_lb_db, replay_core_db):
             # Patch pymongo just to switch DB names if string matches "PLI_Leaderboard"
             pass
 
-        # We use the isolated DB approach via monkeypatching specific calls or names
-        # Safer: Patch `pymongo.MongoClient.__getitem__` to redirect DB names
-        original_getitem = pymongo.MongoClient.__getitem__
-        def redirect_db(self, name):
-            if name == "PLI_Leaderboard": return original_getitem(self, replay_lb_db)
-            if name == "iwell": return original_getitem(self, replay_core_db)
-            return original_getitem(self, name)
-
-        pymongo.MongoClient.__getitem__ = redirect_db
-
-        # Invoke Lumpsum manually per window
-        from Lumpsum_Scorer import _run_lumpsum_for_window
-        # We need to construct args
-        # Lumpsum manual run logic is complex in main.
-        # We reuse the logic we wrote in previous replay script but adapted for DB-level isolation
-        # ... (Similar logic to previous script iteration)
-
-        # Cleanup
-        pymongo.MongoClient.__getitem__ = original_getitem
+        # We use the isolated DB approach: clients Lumpsum constructs (pymongo.MongoClient(...))
+        # while the patch is active are RedirectClients mapping prod DB names onto the replay DBs.
+        # Other MongoClient instances are untouched, and the patch is undone even on error.
+        redirect_cls = make_redirect_client({"PLI_Leaderboard": replay_lb_db, "iwell": replay_core_db})
+        with patch("pymongo.MongoClient", redirect_cls):
+            # Invoke Lumpsum manually per window
+            from Lumpsum_Scorer import _run_lumpsum_for_window
+            # We need to construct args
+            # Lumpsum manual run logic is complex in main.
+            # We reuse the logic we wrote in previous replay script but adapted for DB-level isolation
+            # ... (Similar logic to previous script iteration)
 
     except Exception as e:
         pass
@@ -190,7 +252,7 @@ def main():
         logger.error("FATAL: Replay DB names match Prod.");
         sys.exit(1)
 
-    client = MongoClient(mongo_uri)
+    client = get_client()
     baseline_dir = CONFIG["snapshot"]["baseline_dir"]
 
     load_fixtures(client, replay_lb, replay_core, baseline_dir)
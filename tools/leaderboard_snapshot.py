@@ -5,8 +5,15 @@ import sys
 import datetime
 from datetime import timezone
 import argparse
+import functools
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import pymongo
-from pymongo import MongoClient
+from _mongo import get_client, get_mongo_uri
+from bson import json_util
+from bson.json_util import RELAXED_JSON_OPTIONS
 
 # Load Config
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "regression_config.json")
@@ -17,6 +24,33 @@ if not os.path.exists(CONFIG_PATH):
 with open(CONFIG_PATH) as f:
     CONFIG = json.load(f)
 
+OUTPUT_NAMES = frozenset(c["name"] for c in CONFIG["collections"]["outputs"])
+
+# Relaxed Extended JSON via orjson: BSON types (ObjectId, datetime, Decimal128, ...) are handed
+# to json_util's encoder, giving the same {"$oid"}/{"$date"} shapes json_util.dumps writes;
+# numbers and strings stay plain (leaderboard_diff reads them as-is)
+_bson_default = functools.partial(json_util.default, json_options=RELAXED_JSON_OPTIONS)
+SNAPSHOT_WRITE_BUFFER = 1 << 20
+SNAPSHOT_BATCH_SIZE = 5000
+
+# Collections are exported concurrently (I/O-bound cursors sharing the client's pool)
+SNAPSHOT_WORKERS = 8
+_print_lock = threading.Lock()
+
+def log(msg):
+    with _print_lock:
+        print(msg)
+
+@functools.lru_cache(maxsize=1)
+def _git_sha():
+    # Direct exec (no /bin/sh like os.popen); "" outside a git checkout
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=False
+        ).stdout.strip()
+    except OSError:
+        return ""
+
 def get_target_months(cli_months=None):
     if cli_months:
         return cli_months.split(",")
@@ -39,25 +73,21 @@ def get_target_months(cli_months=None):
         else: resolved.append(m) # Assume literal if not code
     return sorted(list(set(resolved)))
 
-def default_converter(o):
-    if isinstance(o, (datetime.datetime, datetime.date)):
-        return o.isoformat()
-    if isinstance(o, bytes):
-        return str(o)
-    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
-
 def export_collection(db, coll_name, months, out_dir):
     coll = db[coll_name]
 
     # Filter logic
     query = {}
-    if coll_name in [c["name"] for c in CONFIG["collections"]["outputs"]]:
+    if coll_name in OUTPUT_NAMES:
         # Most outputs use period_month or month
-        # We try both
-        if coll.find_one({"period_month": {"$in": months}}):
-            query = {"period_month": {"$in": months}}
-        elif coll.find_one({"month": {"$in": months}}):
-            query = {"month": {"$in": months}}
+        # One probe covers both; the matched doc tells us which field this collection uses
+        probe = coll.find_one(
+            {"$or": [{"period_month": {"$in": months}}, {"month": {"$in": months}}]},
+            {"period_month": 1, "month": 1}
+        )
+        if probe:
+            field = "period_month" if probe.get("period_month") in months else "month"
+            query = {field: {"$in": months}}
         # If Insurance has 'conversion_date' logic? Snapshot all for safety if small, or limit recent?
         # For simplicity in V2, if output collection has no month field found, we export ALL (assuming integration test DB size is managed)
         # OR we rely on 'updated_at' if available?
@@ -84,18 +114,21 @@ def export_collection(db, coll_name, months, out_dir):
             query = {date_field: {"$gte": dt_start}}
 
     try:
-        cursor = coll.find(query)
         count = 0
         out_path = os.path.join(out_dir, f"{coll_name}.jsonl")
 
-        with open(out_path, "w") as f:
+        # Large batches cut getMore round-trips on big txn collections; no_cursor_timeout keeps a
+        # slow snapshot alive, so the cursor is closed explicitly (context manager) even on error.
+        # dates/ObjectIds round-trip through leaderboard_replay's json_util decode
+        with coll.find(query, batch_size=SNAPSHOT_BATCH_SIZE, no_cursor_timeout=True) as cursor, \
+                open(out_path, "wb", buffering=SNAPSHOT_WRITE_BUFFER) as f:
             for doc in cursor:
-                f.write(json.dumps(doc, default=default_converter) + "\n")
+                f.write(orjson.dumps(doc, default=_bson_default, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE))
                 count += 1
-        print(f"  Captured {coll_name}: {count} records")
+        log(f"  Captured {coll_name}: {count} records")
         return count
     except Exception as e:
-        print(f"  Error capturing {coll_name}: {e}")
+        log(f"  Error capturing {coll_name}: {e}")
         return 0
 
 def main():
@@ -112,12 +145,12 @@ def main():
             print(f"FATAL: Snapshotting PROD requires env {allow_var}=true")
             sys.exit(1)
 
-    mongo_uri = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGODB_URI")
+    mongo_uri = get_mongo_uri()
     if not mongo_uri:
         print("Error: MongoDb-Connection-String not found")
         sys.exit(1)
 
-    client = MongoClient(mongo_uri)
+    client = get_client()
     target_months = get_target_months(args.months)
 
     # Detect DBs
@@ -136,10 +169,15 @@ def main():
 
     os.makedirs(args.out_dir, exist_ok=True)
 
-    stats = {}
+    tasks = []
 
     # Inputs
-    for c in CONFIG["collections"]["inputs"]:
+    # One listCollections per DB, filtered to the configured inputs, instead of two per input
+    inputs = CONFIG["collections"]["inputs"]
+    name_filter = {"name": {"$in": inputs}}
+    core_cols = set(client[core_db_name].list_collection_names(filter=name_filter))
+    lb_cols = set(client[db_name].list_collection_names(filter=name_filter))
+    for c in inputs:
         # Routing: Core vs PLI
         # Heuristic: txn/leads in Core?
         # Based on Scorer code inputs:
@@ -157,24 +195,29 @@ def main():
         try_cols = [c]
 
         # Check existence
-        final_coll_name = c
-        if c in client[core_db_name].list_collection_names():
+        if c in core_cols:
             target_db = client[core_db_name]
-        elif c in client[db_name].list_collection_names():
+        elif c in lb_cols:
             target_db = client[db_name]
         else:
             print(f"  Warning: Input collection {c} not found in {db_name} or {core_db_name}")
             continue
 
-        cnt = export_collection(target_db, final_coll_name, target_months, args.out_dir)
-        stats[c] = cnt
+        tasks.append((c, target_db))
 
     # Outputs
     for c_obj in CONFIG["collections"]["outputs"]:
         c = c_obj["name"]
         target_db = client[db_name] # Outputs usually in PLI
-        cnt = export_collection(target_db, c, target_months, args.out_dir)
-        stats[c] = cnt
+        tasks.append((c, target_db))
+
+    # Export all collections concurrently; stats keep the config order for metadata.json
+    with ThreadPoolExecutor(max_workers=SNAPSHOT_WORKERS) as pool:
+        futures = [
+            (c, pool.submit(export_collection, target_db, c, target_months, args.out_dir))
+            for c, target_db in tasks
+        ]
+        stats = {c: fut.result() for c, fut in futures}
 
     # Metadata
     meta = {
@@ -182,7 +225,8 @@ def main():
         "months": target_months,
         "db_source": { "leaderboard": db_name, "core": core_db_name },
         "counts": stats,
-        "git_sha": os.popen("git rev-parse HEAD").read().strip()
+        "fixture_format": "extjson",
+        "git_sha": _git_sha()
     }
     with open(os.path.join(args.out_dir, "metadata.json"), "w") as f:
         json.dump(meta, f, indent=2)
@@ -2,7 +2,9 @@ import os
 import sys
 import datetime
 import logging
-from pymongo import MongoClient
+from pymongo import IndexModel
+from _mongo import get_client
+from reset_seed_v2 import mark_seed_dirty
 from datetime import timezone
 
 # Setup paths
@@ -21,8 +23,9 @@ CONN = os.getenv("MONGODB_CONNECTION_STRING")
 os.environ["MONGODB_CONNECTION_STRING"] = CONN
 os.environ["MONGO_URI"] = CONN # Fallback for some modules
 
-client = MongoClient(CONN)
+client = get_client()
 db_v2 = client["PLI_Leaderboard_v2"]
+mark_seed_dirty(db_v2)  # the seeded DB no longer matches the fixture
 
 # Clear v2 Collections
 colls_to_clear = [
@@ -33,10 +36,20 @@ colls_to_clear = [
 ]
 print("--- Clearing v2 Collections ---")
 for c in colls_to_clear:
-    # Just delete_many({}) even if empty/not exists (it's safe)
+    # drop() is a metadata op (delete_many({}) removes doc by doc); the secondary
+    # indexes are captured first and rebuilt on the empty collection
     try:
-        res = db_v2[c].delete_many({})
-        print(f"Cleared {c}: {res.deleted_count} docs deleted")
+        indexes = []
+        for ix in db_v2[c].list_indexes():
+            if ix["name"] == "_id_":
+                continue
+            opts = {k: v for k, v in ix.items() if k not in ("key", "v", "ns")}
+            indexes.append(IndexModel(list(ix["key"].items()), **opts))
+        n = db_v2[c].estimated_document_count()
+        db_v2[c].drop()
+        if indexes:
+            db_v2[c].create_indexes(indexes)
+        print(f"Cleared {c}: ~{n} docs dropped, {len(indexes)} indexes restored")
     except Exception as e:
         print(f"Error clearing {c}: {e}")
 
@@ -20,6 +20,11 @@ os.environ["APP_ENV"] = "Production"
 def rerun_aggregator():
     logging.basicConfig(level=logging.INFO)
 
+    # Every month would fail identically without a connection string; stop before the loop
+    if not (os.environ.get("MONGODB_CONNECTION_STRING") or os.environ.get("MONGO_URI")):
+        print("MONGODB_CONNECTION_STRING (or MONGO_URI) is not set; aborting rerun.")
+        sys.exit(1)
+
     months = [
         "2025-04", "2025-05", "2025-06", "2025-07",
         "2025-08", "2025-09", "2025-10", "2025-11", "2025-12"
@@ -28,10 +33,11 @@ def rerun_aggregator():
     print("Starting Aggregator Rerun for FY25-26...")
     print(f"Goal: Populate Public_Leaderboard in {os.environ['DB_NAME']}")
 
+    lb_run = Leaderboard.run  # resolved once, not per month
     for m in months:
         print(f"Aggregating {m}...")
         try:
-            Leaderboard.run(month=m, db_name="PLI_Leaderboard_v2")
+            lb_run(month=m, db_name="PLI_Leaderboard_v2")
             print(f"✓ {m} Done")
         except Exception as e:
             print(f"✗ {m} Failed: {e}")
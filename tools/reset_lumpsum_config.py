@@ -1,12 +1,13 @@
 
 import os
-from pymongo import MongoClient
+from _mongo import get_client
+from reset_seed_v2 import mark_seed_dirty
 
-MONGO_URI = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGO_URI")
 DB_NAME = os.getenv("DB_NAME", "PLI_Leaderboard_v2")
 
-client = MongoClient(MONGO_URI)
+client = get_client()
 db = client[DB_NAME]
+mark_seed_dirty(db)  # the seeded DB no longer matches the fixture
 
 print(f"Resetting Lumpsum Config in {DB_NAME}...")
 db.config.update_one(
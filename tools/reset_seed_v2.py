@@ -15,24 +15,142 @@ Usage:
 
 import os
 import sys
+import json
+import hashlib
+import shutil
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from pymongo import MongoClient
+from pymongo import IndexModel
+from bson import json_util
+from _mongo import get_client, get_mongo_uri
 
 # Safety check
-DB_NAME = "PLI_Leaderboard_v2"
-def seed_data():
-    MONGO_URI = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGO_URI")
+DB_NAME = os.getenv("PARITY_DB_NAME", "PLI_Leaderboard_v2")
+
+# Marker recording which version of this script produced the current seed and what the DB
+# looked like right after it. Tools that mutate the seeded DB (scorers, config overrides,
+# rebuilds) also clear it via mark_seed_dirty(); the state digest catches writers that don't.
+SEED_META_COLLECTION = "_seed_meta"
+
+def seed_fingerprint():
+    """sha256 of this script: the fixtures are literals in it, so it fully determines the seed."""
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def db_state_digest(db):
+    """sha256 over every collection's document count plus the full config docs."""
+    h = hashlib.sha256()
+    for name in sorted(db.list_collection_names()):
+        if name == SEED_META_COLLECTION:
+            continue
+        h.update(f"{name}:{db[name].count_documents({})}\n".encode())
+    for doc in db.config.find().sort("_id", 1):
+        h.update(json_util.dumps(doc, sort_keys=True).encode())
+    return h.hexdigest()
+
+def is_seed_current(db):
+    marker = db[SEED_META_COLLECTION].find_one({"_id": "fingerprint"})
+    return (
+        bool(marker)
+        and marker.get("hash") == seed_fingerprint()
+        and marker.get("state") == db_state_digest(db)
+    )
+
+def mark_seed_dirty(db):
+    db[SEED_META_COLLECTION].delete_one({"_id": "fingerprint"})
+
+# mongodump of a freshly seeded DB, restored instead of re-running the inserts while the
+# script is unchanged. Needs the MongoDB database tools on PATH; without them we just reseed.
+SEED_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "seed_v2")
+
+def _seed_cache_path():
+    return os.path.join(SEED_CACHE_DIR, DB_NAME)
+
+@contextmanager
+def _db_tools_config():
+    """
+    Private temp --config file (mkstemp: mode 0600) holding the connection string, so the
+    credentials in it stay out of the mongodump/mongorestore argv and the process list.
+    """
+    fd, path = tempfile.mkstemp(suffix=".yaml")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(f"uri: {json.dumps(get_mongo_uri())}\n")  # a JSON string is valid YAML
+        yield path
+    finally:
+        os.unlink(path)
+
+def restore_seed_cache():
+    """
+    mongorestore the cached dump into the (already dropped) DB_NAME.
+    Returns None if there is no usable cache, else whether the restore succeeded.
+    """
+    cache = _seed_cache_path()
+    hash_path = os.path.join(cache, "SEED_HASH")
+    if not shutil.which("mongorestore") or not os.path.exists(hash_path):
+        return None
+    with open(hash_path) as f:
+        if f.read().strip() != seed_fingerprint():
+            return None
+    with _db_tools_config() as config:
+        res = subprocess.run(
+            ["mongorestore", "--config", config, "--nsInclude", f"{DB_NAME}.*", "--quiet", cache]
+        )
+    return res.returncode == 0
+
+def write_seed_cache():
+    if not shutil.which("mongodump"):
+        return
+    cache = _seed_cache_path()
+    shutil.rmtree(cache, ignore_errors=True)
+    with _db_tools_config() as config:
+        res = subprocess.run(["mongodump", "--config", config, "--db", DB_NAME, "--out", cache, "--quiet"])
+    if res.returncode == 0:
+        with open(os.path.join(cache, "SEED_HASH"), "w") as f:
+            f.write(seed_fingerprint())
+
+# Source-collection indexes for the scorer queries, plus the snapshot indexes on the scorer
+# outputs (queried by month OR period_month and sorted by employee_id, so both branches can
+# stream in index order)
+_SNAPSHOT_INDEXES = [
+    IndexModel([("month", 1), ("employee_id", 1)]),
+    IndexModel([("period_month", 1), ("employee_id", 1)]),
+]
+SEED_INDEXES = {
+    "transactions": [IndexModel([("category", 1), ("transactionType", 1), ("transactionFor", 1)])],
+    "purchase_txn": [IndexModel([("RM Name", 1), ("Trxn Date", 1)])],
+    "redemption_txn": [IndexModel([("RM Name", 1), ("Trxn Date", 1)])],
+    "AUM_Report": [IndexModel([("MAIN RM", 1), ("Month", 1)])],
+    "Zoho_Users": [IndexModel([("employee_id_str", 1)])],
+    "Leaderboard_Lumpsum": _SNAPSHOT_INDEXES,
+    "MF_SIP_Leaderboard": _SNAPSHOT_INDEXES,
+    "Public_Leaderboard": _SNAPSHOT_INDEXES,
+}
+
+def seed_data(skip_if_current=False):
+    MONGO_URI = get_mongo_uri()  # what get_client() and the scorer runners connect with
+
+    if not DB_NAME.startswith("PLI_Leaderboard_v2"):
+        print(f"ERROR: Refusing to seed {DB_NAME}; target must be PLI_Leaderboard_v2*")
+        sys.exit(1)
 
     if not MONGO_URI:
         print("ERROR: MongoDb-Connection-String env var not set")
         sys.exit(1)
 
     print(f"Connecting to MongoDB...")
-    client = MongoClient(MONGO_URI)
+    client = get_client()
     db = client[DB_NAME]
 
     print(f"Target database: {DB_NAME}")
 
+    if skip_if_current and is_seed_current(db):
+        print("Seed fingerprint unchanged and DB untouched since seeding; skipping reseed.")
+        return
+
     # Only verify interactions if running as script, or pass a flag.
     # For now, we trust the caller (like the test runner) to handle safety or accept force mode.
     # Check env var for confirmation or interactive mode
@@ -43,30 +161,37 @@ def seed_data():
             print("Aborted.")
             sys.exit(0)
 
-    # Drop all collections
-    print(f"\nDropping all collections in {DB_NAME}...")
-    for collection_name in db.list_collection_names():
-        db[collection_name].drop()
-        print(f"  Dropped: {collection_name}")
-
-    # Explicitly drop known collections to be safe against list_collection_names lagging
-    db.Zoho_Users.drop()
-    db.AUM_Report.drop()
-    db.purchase_txn.drop()
-    db.redemption_txn.drop()
-    db.transactions.drop()
-    db.Admin_Permissions.drop()
-    db.config.drop()
-    db.Leaderboard_Lumpsum.drop()
-    db.MF_SIP_Leaderboard.drop()
-    db.Public_Leaderboard.drop()
-
-    print("\nSeeding fixture data...")
+    # Drop the whole database with one dropDatabase command (also clears the seed fingerprint).
+    # No re-listing afterwards: collections are recreated implicitly by the first insert.
+    print(f"\nDropping database {DB_NAME}...")
+    db.command("dropDatabase")
+
+    restored = restore_seed_cache()
+    if restored:
+        print(f"Restored {DB_NAME} from seed cache {_seed_cache_path()}")
+        return
+    if restored is False:
+        # A partial restore would leave duplicate keys for the inserts below: start clean again.
+        print(f"Seed cache restore failed for {DB_NAME}; dropping and seeding from fixtures.")
+        db.command("dropDatabase")
+
+    # Progress lines are collected and written once at the end rather than printed per step
+    log = ["\nSeeding fixture data..."]
+    fixtures = {}
 
     # ============================================================================
-    # 1. Zoho_Users (Employee master data)
+    # 1. Indexes, created on the empty collections so the inserts below maintain
+    #    them instead of a build over existing data afterwards
     # ============================================================================
-    print("\n[1/7] Seeding Zoho_Users...")
+    log.append("\n[1/7] Creating indexes...")
+    for col_name, models in SEED_INDEXES.items():
+        db[col_name].create_indexes(models)
+    log.append(f"  Indexed {', '.join(SEED_INDEXES)}")
+
+    # ============================================================================
+    # 2. Zoho_Users (Employee master data)
+    # ============================================================================
+    log.append("\n[2/7] Seeding Zoho_Users...")
     zoho_users = [
         {
             "_id": "test_emp_001",
@@ -74,6 +199,7 @@ def seed_data():
             "email": "test1@example.com",
             "employee_id": "EMP001",
             "id": "EMP001",
+            "employee_id_str": "EMP001",  # Leaderboard Zoho join key
             "Active": "active",
             "status": "active"
         },
@@ -83,6 +209,7 @@ def seed_data():
             "email": "test2@example.com",
             "employee_id": "EMP002",
             "id": "EMP002",
+            "employee_id_str": "EMP002",  # Leaderboard Zoho join key
             "Active": "active",
             "status": "active"
         },
@@ -92,6 +219,7 @@ def seed_data():
             "email": "test3@example.com",
             "employee_id": "EMP003",
             "id": "EMP003",
+            "employee_id_str": "EMP003",  # Leaderboard Zoho join key
             "Active": "inactive",
             "status": "inactive",
             "inactive_since": datetime(2025, 10, 1) # Inactive before our test month
@@ -102,6 +230,7 @@ def seed_data():
             "email": "testgate@example.com",
             "employee_id": "EMPGATE",
             "id": "EMPGATE",
+            "employee_id_str": "EMPGATE",  # Leaderboard Zoho join key
             "Active": "active",
             "status": "active"
         },
@@ -111,21 +240,21 @@ def seed_data():
             "email": "testzero@example.com",
             "employee_id": "EMPZERO",
             "id": "EMPZERO",
+            "employee_id_str": "EMPZERO",  # Leaderboard Zoho join key
             "Active": "active",
             "status": "active"
         }
     ]
-    db.Zoho_Users.insert_many(zoho_users)
-    print(f"  Inserted {len(zoho_users)} users")
+    fixtures["Zoho_Users"] = zoho_users
 
     # Test Month: November 2025
     test_month_start = "2025-11-01" # For AUM
     test_month_dt = datetime(2025, 11, 1)
 
     # ============================================================================
-    # 2. AUM_Report (Source for Lumpsum AUM)
+    # 3. AUM_Report (Source for Lumpsum AUM)
     # ============================================================================
-    print("\n[2/7] Seeding AUM_Report...")
+    log.append("\n[3/7] Seeding AUM_Report...")
     # Lumpsum Scorer expects: "MAIN RM" (uppercase), "Month" (YYYY-MM-DD), "Amount"
     aum_records = [
         # Employee 1: 6 Crore AUM (Base for NP calc)
@@ -139,13 +268,12 @@ def seed_data():
         # Zero guy
         {"MAIN RM": "TEST ZERO DATA", "Month": test_month_start, "Amount": 0},
     ]
-    db.AUM_Report.insert_many(aum_records)
-    print(f"  Inserted {len(aum_records)} AUM records")
+    fixtures["AUM_Report"] = aum_records
 
     # ============================================================================
-    # 3. purchase_txn (Lumpsum Additions)
+    # 4. purchase_txn (Lumpsum Additions)
     # ============================================================================
-    print("\n[3/7] Seeding purchase_txn...")
+    log.append("\n[4/7] Seeding purchase_txn...")
     # Needs: "RM Name", "Amount", "Trxn Date"
     # Lumpsum Scorer normalizes RM Name
     purchase_txns = [
@@ -162,13 +290,12 @@ def seed_data():
             "Trxn Date": datetime(2025, 11, 10)
         }
     ]
-    db.purchase_txn.insert_many(purchase_txns)
-    print(f"  Inserted {len(purchase_txns)} purchase records")
+    fixtures["purchase_txn"] = purchase_txns
 
     # ============================================================================
-    # 4. redemption_txn (Lumpsum Subtractions)
+    # 5. redemption_txn (Lumpsum Subtractions)
     # ============================================================================
-    print("\n[4/7] Seeding redemption_txn...")
+    log.append("\n[5/7] Seeding redemption_txn...")
     redemption_txns = [
         # Employee Inactive: Big redemption
         {
@@ -183,15 +310,14 @@ def seed_data():
             "Trxn Date": datetime(2025, 11, 20)
         }
     ]
-    db.redemption_txn.insert_many(redemption_txns)
-    print(f"  Inserted {len(redemption_txns)} redemption records")
+    fixtures["redemption_txn"] = redemption_txns
 
     # ... switch, cob (leaving empty for now to keep simple)
 
     # ============================================================================
-    # 5. transactions (SIP Scorer Source)
+    # 6. transactions (SIP Scorer Source)
     # ============================================================================
-    print("\n[5/7] Seeding transactions (for SIP Scorer)...")
+    log.append("\n[6/7] Seeding transactions (for SIP Scorer)...")
     # SIP Scorer BuildTxnDF queries 'transactions' collection
     # Needs: 'category': 'systematic', 'transactionType': 'Link', 'transactionFor': 'Purchase'
     # 'reconciliation.reconcileStatus': 'RECONCILED'
@@ -251,22 +377,38 @@ def seed_data():
             "createdAt": datetime(2025, 11, 15)
         }
     ]
-    db.transactions.insert_many(sip_txns)
-    print(f"  Inserted {len(sip_txns)} SIP transaction records")
+    fixtures["transactions"] = sip_txns
 
     # ============================================================================
-    # 6. Admin_Permissions (Minimal)
+    # 7. Admin_Permissions (Minimal)
     # ============================================================================
-    print("\n[6/7] Seeding Admin_Permissions...")
-    db.Admin_Permissions.insert_one({"email": "admin@example.com", "role": "admin"})
-    print(f"  Inserted 1 admin permission records")
-
-    print("\n======================================================================")
-    print("✓ Source Data Seed Complete!")
-    print("======================================================================")
-    print(f"Database: {DB_NAME}")
-    print("Test Month: 2025-11")
-    print("Ready for Scoring Runner.")
+    log.append("\n[7/7] Seeding Admin_Permissions...")
+    fixtures["Admin_Permissions"] = [{"email": "admin@example.com", "role": "admin"}]
+
+    # The collections are independent, so the six insert_many calls go out concurrently,
+    # each on its own pooled connection, instead of as six sequential round-trips
+    with ThreadPoolExecutor(max_workers=len(fixtures)) as pool:
+        inserted = dict(zip(fixtures, pool.map(
+            lambda item: len(db[item[0]].insert_many(item[1], ordered=False).inserted_ids), fixtures.items()
+        )))
+    for col_name, n in inserted.items():
+        log.append(f"  Inserted {n} {col_name} records")
+
+    db[SEED_META_COLLECTION].replace_one(
+        {"_id": "fingerprint"},
+        {"_id": "fingerprint", "hash": seed_fingerprint(), "state": db_state_digest(db)},
+        upsert=True,
+    )
+    # Dumped after the fingerprint so a restored DB also counts as freshly seeded
+    write_seed_cache()
+
+    log.append("\n======================================================================")
+    log.append("✓ Source Data Seed Complete!")
+    log.append("======================================================================")
+    log.append(f"Database: {DB_NAME}")
+    log.append("Test Month: 2025-11")
+    log.append("Ready for Scoring Runner.")
+    sys.stdout.write("\n".join(log) + "\n")
 
 
 if __name__ == "__main__":
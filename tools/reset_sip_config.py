@@ -1,17 +1,25 @@
 
 import os
-from pymongo import MongoClient
+from _mongo import get_client
+from reset_seed_v2 import mark_seed_dirty
 
-MONGO_URI = os.getenv("MONGODB_CONNECTION_STRING") or os.getenv("MONGO_URI")
 DB_NAME = os.getenv("DB_NAME", "PLI_Leaderboard_v2")
 
-client = MongoClient(MONGO_URI)
-db = client[DB_NAME]
 
-print(f"Resetting SIP Config to Defaults (Horizon=24) in {DB_NAME}...")
-db.config.update_one(
-    {"_id": "Leaderboard_SIP"},
-    {"$set": {"options.sip_horizon_months": 24, "version": 1}},
-    upsert=True
-)
-print("Done.")
+def main():
+    client = get_client()
+    db = client[DB_NAME]
+    mark_seed_dirty(db)  # the seeded DB no longer matches the fixture
+
+    print(f"Resetting SIP Config to Defaults (Horizon=24) in {DB_NAME}...")
+    db.config.update_one(
+        {"_id": "Leaderboard_SIP"},
+        {"$set": {"options.sip_horizon_months": 24, "version": 1}},
+        upsert=True,
+        bypass_document_validation=True,
+    )
+    print("Done.")
+
+
+if __name__ == "__main__":
+    main()
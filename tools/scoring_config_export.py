@@ -2,11 +2,12 @@ import os
 import sys
 import json
 import logging
-import pymongo
-from bson import json_util
+import functools
+import argparse
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+@functools.lru_cache(maxsize=1)
 def load_settings():
     try:
         with open("local.settings.json", "r") as f:
@@ -22,10 +23,11 @@ def get_db():
     if not uri:
         logging.error("No connection string found.")
         sys.exit(1)
+    import pymongo  # deferred so `--help` doesn't pay for the driver import
     client = pymongo.MongoClient(uri)
     return client[db_name]
 
-def export_config(module):
+def export_config(module, fields=None, compact=False):
     db = get_db()
     # Assume default collection 'config'
     coll = db["config"]
@@ -38,15 +40,26 @@ def export_config(module):
         logging.error("Module must be 'lumpsum' or 'sip'")
         return
 
-    doc = coll.find_one({"_id": doc_id})
+    # Only ship the requested top-level fields (e.g. schema,status) instead of the whole doc
+    projection = {f: 1 for f in fields} if fields else None
+    doc = coll.find_one({"_id": doc_id}, projection)
     if not doc:
         logging.error(f"Config not found for {doc_id}")
         return
 
-    print(json_util.dumps(doc, indent=2))
+    from bson import json_util
+    if compact:
+        # For scripted consumers: no indentation or spaces after separators
+        print(json_util.dumps(doc, separators=(",", ":")))
+    else:
+        print(json_util.dumps(doc, indent=2))
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 tools/scoring_config_export.py <lumpsum|sip>")
-        sys.exit(1)
-    export_config(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Export scoring config as JSON")
+    parser.add_argument("module", choices=["lumpsum", "sip"], help="Config to export")
+    parser.add_argument("--compact", action="store_true", help="Emit single-line JSON")
+    parser.add_argument("--fields", help="Comma-separated top-level fields to export (default: all)")
+
+    args = parser.parse_args()
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()] if args.fields else None
+    export_config(args.module, fields, args.compact)
@@ -2,14 +2,14 @@ import os
 import sys
 import json
 import logging
+import functools
 import argparse
 import datetime
 from datetime import timezone
-import pymongo
-from bson import json_util
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 
+@functools.lru_cache(maxsize=1)
 def load_settings():
     try:
         with open("local.settings.json", "r") as f:
@@ -25,13 +25,16 @@ def get_db():
     if not uri:
         logging.error("No connection string found.")
         sys.exit(1)
+    import pymongo  # deferred so `--help` doesn't pay for the driver import
     client = pymongo.MongoClient(uri)
     return client[db_name]
 
 def import_config(file_path, activate):
+    from bson import json_util
     try:
         with open(file_path, 'r') as f:
-            doc = json_util.loads(f.read())
+            # Decode straight from the file handle; object_hook restores $date/$oid like json_util.loads
+            doc = json.load(f, object_hook=json_util.object_hook)
     except Exception as e:
         logging.error(f"Failed to read file: {e}")
         return
@@ -51,6 +54,8 @@ def import_config(file_path, activate):
     db = get_db()
     coll = db["config"]
 
+    # No bypass_document_validation: the doc comes from an arbitrary file, so server-side
+    # validation is the check that matters here
     res = coll.replace_one({"_id": doc_id}, doc, upsert=True)
 
     logging.info(f"Imported {doc_id}: Matched={res.matched_count}, Modified={res.modified_count}, Upserted={res.upserted_id}")
@@ -1,11 +1,11 @@
 
 import os
 import logging
+import functools
+import re
 import jwt
 from http.cookies import SimpleCookie
 import azure.functions as func
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
 
 def get_public_key():
     """
@@ -15,6 +15,16 @@ def get_public_key():
     if not public_key_str:
         logging.warning("JWT_PUBLIC_KEY environment variable is not set.")
         return None
+    return _load_public_key(public_key_str)
+
+@functools.lru_cache(maxsize=4)
+def _load_public_key(public_key_str: str):
+    """
+    Parses the PEM once per distinct JWT_PUBLIC_KEY value; a rotated key is a new cache entry.
+    """
+    # cryptography is only needed once a key is actually configured
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.backends import default_backend
 
     # Ensure correct PEM format if possibly stripped
     # Ensure correct PEM format if possibly stripped or has escaped newlines
@@ -61,6 +71,11 @@ def verify_jwt_token(token: str) -> dict | None:
 
     return None
 
+@functools.lru_cache(maxsize=4)
+def _cookie_re(cookie_name: str):
+    """Matches each unquoted `name=value` pair in a Cookie header (SimpleCookie's whitespace rules)."""
+    return re.compile(r'(?:^|;)\s*' + re.escape(cookie_name) + r'\s*=\s*([^;"]*)')
+
 def get_email_from_jwt_cookie(req: func.HttpRequest) -> str | None:
     """
     Extracts the JWT from the cookie and returns the email if valid.
@@ -79,11 +94,18 @@ def get_email_from_jwt_cookie(req: func.HttpRequest) -> str | None:
     cookie_name = os.getenv("JWT_COOKIE_NAME", "auth_token")
 
     try:
-        simple_cookie = SimpleCookie()
-        simple_cookie.load(cookie_header)
+        # JWTs are plain base64url, so a regex scan finds the token; SimpleCookie's full parse
+        # is only needed for quoted/escaped values the regex leaves alone. Like SimpleCookie,
+        # a duplicated cookie name resolves to the LAST occurrence.
+        matches = _cookie_re(cookie_name).findall(cookie_header)
+        token = matches[-1].strip() if matches else None
+        if not token and '"' in cookie_header:
+            simple_cookie = SimpleCookie()
+            simple_cookie.load(cookie_header)
+            if cookie_name in simple_cookie:
+                token = simple_cookie[cookie_name].value
 
-        if cookie_name in simple_cookie:
-            token = simple_cookie[cookie_name].value
+        if token:
             payload = verify_jwt_token(token)
             if payload:
                 # Adjust these keys based on your specific JWT payload structure
@@ -1,10 +1,24 @@
 import os
+import atexit
 import pymongo
 import logging
 
 # Global cache for the MongoDB client to enable connection pooling across invocations
 _CLIENT_CACHE = None
 
+# Connection-string settings, checked in order (most common first)
+_URI_ENV_KEYS = (
+    "MongoDb-Connection-String",
+    "MONGODB_CONNECTION_STRING",
+    "CUSTOMCONNSTR_MongoDb-Connection-String",
+    "MongoDbConnectionString",
+    "DB_CONNECTION_STRING",
+)
+
+# Pool defaults for a Functions worker (callers' kwargs override): a small pool that can
+# shrink to nothing when idle, and a bounded wait when the cluster is unreachable
+_CLIENT_DEFAULTS = {"maxPoolSize": 10, "minPoolSize": 0, "serverSelectionTimeoutMS": 10000}
+
 def get_db_client(**kwargs):
     """
     Returns a PyMongo client using the connection string from environment variables.
@@ -15,41 +29,39 @@ def get_db_client(**kwargs):
     if _CLIENT_CACHE:
         return _CLIENT_CACHE
 
-    # List of keys to check in order
-    keys = [
-        "MongoDb-Connection-String",
-        "MONGODB_CONNECTION_STRING",
-        "CUSTOMCONNSTR_MongoDb-Connection-String",
-        "MongoDbConnectionString",
-        "DB_CONNECTION_STRING"
-    ]
-
-    uri = None
-    for key in keys:
-        val = os.getenv(key)
-        if val:
-            uri = val
-            break
+    # Stops at the first key that is set
+    uri = next((val for key in _URI_ENV_KEYS if (val := os.getenv(key))), None)
 
     if not uri:
         # CRITICAL: Prevent fallback to localhost:27017
-        error_msg = f"MongoDB Connection String not found in environment variables. Checked: {keys}"
+        error_msg = f"MongoDB Connection String not found in environment variables. Checked: {list(_URI_ENV_KEYS)}"
         logging.critical(error_msg)
         raise Exception(error_msg)
 
     try:
         # Create new client and cache it
-        client = pymongo.MongoClient(uri, **kwargs)
+        client = pymongo.MongoClient(uri, **{**_CLIENT_DEFAULTS, **kwargs})
         _CLIENT_CACHE = client
+        # Release the pooled sockets when the worker shuts down
+        atexit.register(client.close)
         return client
     except Exception as e:
         logging.critical(f"Failed to create MongoClient: {e}")
         raise
 
+# (db_name_env, default_db) -> (client, Database); entries built on another client are stale
+_DB_HANDLES = {}
+
 def get_db(db_name_env="PLI_DB_NAME", default_db="PLI_Leaderboard_v2"):
     """
     Returns the database object.
     """
     client = get_db_client()
+    key = (db_name_env, default_db)
+    cached = _DB_HANDLES.get(key)
+    if cached is not None and cached[0] is client:
+        return cached[1]
     db_name = os.getenv(db_name_env, os.getenv("DB_NAME", default_db))
-    return client[db_name]
+    db = client[db_name]
+    _DB_HANDLES[key] = (client, db)
+    return db
@@ -1,22 +1,40 @@
 import json
 import azure.functions as func
 import os
+import types
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+def _dumps(body) -> bytes:
+    # orjson encodes straight to UTF-8 bytes; OPT_NON_STR_KEYS keeps json.dumps' handling of int keys
+    if orjson is not None:
+        return orjson.dumps(body, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(body).encode()
+
+# App settings only change on a host restart, so the CORS headers are built once at import
+# and shared read-only (HttpResponse copies them into its own header list)
+_ALLOWED_ORIGIN = os.getenv("ALLOWED_ORIGIN")
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": _ALLOWED_ORIGIN,
+    "Access-Control-Allow-Credentials": "true",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+}
+_CORS_HEADERS_VIEW = types.MappingProxyType(_CORS_HEADERS)
 
 def cors_headers():
-    return {
-        "Access-Control-Allow-Origin": os.getenv("ALLOWED_ORIGIN"),
-        "Access-Control-Allow-Credentials": "true",
-        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type, Authorization",
-    }
+    return _CORS_HEADERS_VIEW
 
 def respond(body=None, status=200):
     return func.HttpResponse(
-        json.dumps(body) if body is not None else "",
+        _dumps(body) if body is not None else b"",
         status_code=status,
         mimetype="application/json",
-        headers=cors_headers()
+        headers=_CORS_HEADERS_VIEW
     )
 
 def options_response():
-    return func.HttpResponse("", status_code=204, headers=cors_headers())
+    return func.HttpResponse(b"", status_code=204, headers=_CORS_HEADERS_VIEW)
@@ -1,34 +1,98 @@
 import os
+import time
 import logging
+import functools
+import threading
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
 from .auth_utils import get_email_from_jwt_cookie
 from .db_utils import get_db
 
-def get_allowed_emails(env_var_name: str) -> set[str]:
+@functools.lru_cache(maxsize=8)
+def get_allowed_emails(env_var_name: str) -> frozenset[str]:
+    # Parsed once per env var; the lists only change with a host restart
     raw = os.getenv(env_var_name, "")
-    return {e.strip().lower() for e in raw.split(",") if e.strip()}
-
-import pymongo
+    return frozenset(e.strip().lower() for e in raw.split(",") if e.strip())
+
+# Role lookups are by email (one permissions doc per user). The unique email_1 index is created
+# by tools/init_p2_db.py, not from the request path; the lookup only hints it once it is known
+# to exist, so a missing index degrades to a planned query, not an error.
+_EMAIL_INDEX = "email_1"
+_INDEXES_READY = False
+# listIndexes is checked once per worker, whatever the outcome
+_INDEXES_CHECKED = False
+
+def _check_indexes(db):
+    global _INDEXES_READY, _INDEXES_CHECKED
+    _INDEXES_CHECKED = True
+    try:
+        _INDEXES_READY = _EMAIL_INDEX in db.Admin_Permissions.index_information()
+    except Exception as e:
+        logging.warning(f"Index check warning: {e}")
 
 def _get_db():
+    # get_db() memoizes the handle per cached client (rebuilt only if _CLIENT_CACHE is replaced)
     try:
-        return get_db(default_db="PLI_Leaderboard")
-    except:
+        db = get_db(default_db="PLI_Leaderboard")
+    except Exception as e:
+        # get_db_client() raises a plain Exception when no connection string is configured
+        logging.warning("RBAC DB unavailable: %s", e)
         return None
+    if not _INDEXES_CHECKED:
+        _check_indexes(db)
+    return db
+
+# Admin_Permissions roles cached per email as (roles, expires_at) so is_admin/is_manager cost
+# at most one find_one per ROLE_CACHE_TTL_S; entries expire individually so role grants
+# propagate, and the oldest entry is evicted past ROLE_CACHE_MAXSIZE. The Python worker
+# runs requests on several threads, hence the lock.
+ROLE_CACHE_TTL_S = 60
+ROLE_CACHE_MAXSIZE = 1024
+_ROLE_CACHE: dict[str, tuple[frozenset, float]] = {}
+_ROLE_CACHE_LOCK = threading.Lock()
+
+def _get_user_roles(email: str) -> frozenset:
+    if not email:
+        return frozenset()
+    now = time.monotonic()
+    with _ROLE_CACHE_LOCK:
+        hit = _ROLE_CACHE.get(email)
+    if hit is not None and hit[1] > now:
+        return hit[0]
 
-def _check_db_role(email: str, role: str) -> bool:
-    if not email: return False
     db = _get_db()
     if db is None:
-        return False
-
-    user = db.Admin_Permissions.find_one({"email": email})
-    if not user: return False
-
-    roles = user.get("roles", [])
-    return role in roles
+        return frozenset()
+    try:
+        # Roles a few seconds stale are fine; stalling on a primary failover is not
+        perms = db.get_collection(
+            "Admin_Permissions",
+            read_preference=ReadPreference.PRIMARY_PREFERRED,
+            read_concern=ReadConcern("local"),
+        )
+        hint = {"hint": _EMAIL_INDEX} if _INDEXES_READY else {}
+        user = perms.find_one({"email": email}, {"roles": 1, "_id": 0}, **hint)
+    except Exception as e:
+        # Fail closed and leave the cache untouched so the next call retries
+        logging.warning(f"RBAC role lookup failed for {email}: {e}")
+        return frozenset()
+    roles = frozenset(user.get("roles", [])) if user else frozenset()
+
+    with _ROLE_CACHE_LOCK:
+        _ROLE_CACHE.pop(email, None)
+        while len(_ROLE_CACHE) >= ROLE_CACHE_MAXSIZE:
+            # dicts keep insertion order: the first key is the oldest entry
+            del _ROLE_CACHE[next(iter(_ROLE_CACHE))]
+        _ROLE_CACHE[email] = (roles, now + ROLE_CACHE_TTL_S)
+    return roles
+
+# Admin_Permissions roles that grant each check
+_MANAGER_ROLES = frozenset({"admin", "manager", "super_admin"})
+_ADMIN_ROLES = frozenset({"admin", "super_admin"})
 
 def is_manager(email: str) -> bool:
     if not email: return False
+    # Forecast_API passes raw JWT emails; the allow-lists and Admin_Permissions are lowercase
     email = email.lower()
 
     # Check Env
@@ -38,10 +102,11 @@ def is_manager(email: str) -> bool:
         return True
 
     # Check DB
-    return _check_db_role(email, "admin") or _check_db_role(email, "manager") or _check_db_role(email, "super_admin")
+    return bool(_get_user_roles(email) & _MANAGER_ROLES)
 
 def is_admin(email: str) -> bool:
     if not email: return False
+    # Forecast_API passes raw JWT emails; the allow-lists and Admin_Permissions are lowercase
     email = email.lower()
 
     # Check Env
@@ -50,28 +115,31 @@ def is_admin(email: str) -> bool:
         return True
 
     # Check DB
-    return _check_db_role(email, "admin") or _check_db_role(email, "super_admin")
+    return bool(_get_user_roles(email) & _ADMIN_ROLES)
+
+# Dev/test decision for honouring X-User-Email, fixed for the lifetime of the function host
+# (it restarts on an app-settings change)
+_ALLOW_HEADER_EMAIL = (
+    os.getenv("AZURE_FUNCTIONS_ENVIRONMENT") != "Production" or
+    os.getenv("DEBUG_RBAC") == "1" or
+    os.getenv("E2E_MODE") == "1"
+)
 
 def get_user_email(req) -> str | None:
     # 1. Try x-ms-client-principal-name (Azure App Service Auth) - ALWAYS honored
+    # Emails are returned lowercased so RBAC checks can test them as-is
     val = req.headers.get("x-ms-client-principal-name")
-    if val: return val
+    if val: return val.lower()
 
     # 1.5 Try JWT from Cookie (Shared logic)
     val = get_email_from_jwt_cookie(req)
-    if val: return val
+    if val: return val.lower()
 
     # 2. Dev/Test-only: Allow X-User-Email (for E2E tests, local development)
     # CRITICAL: In Production, ignore X-User-Email to prevent spoofing
-    is_dev_or_test = (
-        os.getenv("AZURE_FUNCTIONS_ENVIRONMENT") != "Production" or
-        os.getenv("DEBUG_RBAC") == "1" or
-        os.getenv("E2E_MODE") == "1"
-    )
-
-    if is_dev_or_test:
+    if _ALLOW_HEADER_EMAIL:
         val = req.headers.get("X-User-Email")
-        if val: return val
+        if val: return val.lower()
         return "vilakshan@niveshonline.com"
 
     return None